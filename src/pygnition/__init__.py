@@ -4,7 +4,7 @@ from importlib import import_module
 from pathlib import Path
 import sys
 
-from ._auto_doc import auto_class_doc, auto_doc, AUTO_DOC_HEAD
+from ._auto_doc import auto_class_doc, auto_doc, AUTO_DOC_HEAD, render_doc
 from ._imports import import_chain
 
 def get_project_nv(s: str | Path) -> (str, str):
@@ -64,3 +64,18 @@ Check the package [reference documentation](docs/markdown/index.md) for details.
 
 CWD = Path.cwd()
 
+def __getattr__(name: str):
+    """
+    Import submodules on first attribute access (PEP 562), so that
+    `pygnition.dialogs` only loads tkinter when it is actually used.
+    (`__package__` rather than `__name__`: the `_metadata` update above
+    replaces `__name__`.)
+    """
+    if not name.startswith('_'):
+        try:
+            return import_module(f'.{name}', __package__)
+        except ModuleNotFoundError as e:
+            if e.name != f'{__package__}.{name}':
+                raise
+    raise AttributeError(f"module {__package__!r} has no attribute {name!r}")
+
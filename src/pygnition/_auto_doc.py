@@ -35,21 +35,178 @@ details here.
 
 """
 
-import inspect, re, textwrap
+import atexit, inspect, json, os, re, sys, textwrap
 
 from datetime import date
+from hashlib import sha1
 from pathlib import Path
 
+from ._cache import CACHE_DIR, write_atomic
+
 unwrap = __import__('inspect').unwrap
 
 AUTO_DOC_HEAD = '## `{name}`\n{version} : {date}'
 
-def auto_doc(heading_template=None, heading_level=2):
+# Modules whose presence means someone is going to read the generated docstrings.
+DOC_READERS = {'pydoc', 'doctest', 'sphinx', 'IPython', 'ipykernel'}
+
+def docs_are_read() -> bool:
+    """
+    Guess whether anything in this process will read the Markdown docstrings:
+    an interactive session, Jupyter, pydoc, doctest or a Sphinx build.
+    `$PYGNITION_AUTO_DOC` (`eager` or `lazy`) overrides the guess.
+    """
+    mode = os.environ.get('PYGNITION_AUTO_DOC', '').lower()
+    if mode in ('eager', 'lazy'):
+        return mode == 'eager'
+    return (hasattr(sys, 'ps1') or bool(sys.flags.interactive)
+            or Path(sys.argv[0] if sys.argv else '').stem in ('pydoc', 'pydoc3')
+            or not DOC_READERS.isdisjoint(sys.modules))
+
+# Render docstrings when something reads them rather than at decoration time.
+LAZY_DOCS = not docs_are_read()
+
+# Functions whose docstrings `auto_doc` deferred, rendered when a doc reader is imported.
+_PENDING_DOCS = list()
+
+def render_pending_docs():
+    """ Render every deferred function docstring and stop deferring new ones. """
+    global LAZY_DOCS
+    LAZY_DOCS = False
+    while _PENDING_DOCS:
+        render_doc(_PENDING_DOCS.pop())
+
+class DocReaderHook:
+    """
+    Import hook that renders the deferred docstrings just before a module in
+    `DOC_READERS` is imported, so `help()` (which imports `pydoc` when it's
+    first called), `pydoc.render_doc()` and doctest see the full docstrings
+    even though `__doc__` can't be lazy on a function. It never imports anything itself.
+    """
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname in DOC_READERS:
+            sys.meta_path.remove(self)
+            render_pending_docs()
+        return None
+
+if LAZY_DOCS:
+    sys.meta_path.insert(0, DocReaderHook())
+
+class LazyDoc:
+    """ Class `__doc__` descriptor that renders the docstring the first time it's read. """
+
+    def __init__(self, render, original=None):
+        self.render = render
+        self.original = original
+        self.doc = None
+        self.rendering = False
+
+    def __get__(self, instance, owner=None):
+        if self.doc is None:
+            if self.rendering:  # e.g. `inspect.getmembers()` reading `__doc__` mid-render
+                return self.original
+            self.rendering = True
+            try:
+                self.doc = self.render()
+            finally:
+                self.rendering = False
+        return self.doc
+
+DOC_CACHE_DIR = CACHE_DIR / 'docs'
+
+class DocCache:
+    """
+    Rendered docstrings for one source file, saved as JSON under `DOC_CACHE_DIR`.
+    The whole cache is thrown away when the file's contents (or the package
+    version and date that go into every heading) change.
+    """
+
+    def __init__(self, source: Path):
+        self.source = source
+        self.file = DOC_CACHE_DIR / f'{sha1(str(source).encode()).hexdigest()[:16]}.json'
+        self.key = f'{sha1(source.read_bytes()).hexdigest()} {VERSION} {LAST_SAVED_DATE}'
+        self.docs = dict()
+        self.dirty = False
+        try:
+            data = json.loads(self.file.read_text())
+            if data['source'] == str(source) and data['key'] == self.key:
+                self.docs = data['docs']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def get(self, name: str, render) -> str:
+        """ Return the cached docstring `name`, calling `render()` on a miss. """
+        doc = self.docs.get(name)
+        if doc is None:
+            doc = self.docs[name] = render()
+            self.dirty = True
+        return doc
+
+    def save(self):
+        if not self.dirty:
+            return
+        if write_atomic(self.file, json.dumps({'source': str(self.source), 'key': self.key, 'docs': self.docs})):
+            self.dirty = False
+
+_DOC_CACHES: dict[str, DocCache | None] = dict()
+
+def cached_doc(obj, render) -> str:
+    """
+    Return `render()` for the function or class `obj`, reusing the result
+    saved for the current source of its module if there is one.
+    """
+    try:
+        source = inspect.getsourcefile(obj)
+    except TypeError:
+        source = None
+    if not source:
+        return render()
+    if source not in _DOC_CACHES:
+        try:
+            _DOC_CACHES[source] = DocCache(Path(source))
+        except OSError:
+            _DOC_CACHES[source] = None
+    doc_cache = _DOC_CACHES[source]
+    if doc_cache is None:
+        return render()
+    code = getattr(obj, '__code__', None)
+    # Line number too, since singledispatch implementations all share the name `_`
+    name = f'{obj.__qualname__}:{code.co_firstlineno}' if code else obj.__qualname__
+    return doc_cache.get(name, render)
+
+@atexit.register
+def save_doc_caches():
+    for doc_cache in _DOC_CACHES.values():
+        if doc_cache:
+            doc_cache.save()
+
+def render_doc(obj) -> str | None:
+    """
+    Return `obj.__doc__`, first rendering it if `auto_doc` deferred it.
+    Classes render themselves on access; functions can't hold a descriptor
+    in `__doc__`, so `auto_doc` parks the renderer in `__auto_doc__` instead.
+    """
+    target = inspect.unwrap(getattr(obj, '__func__', obj))
+    render = getattr(target, '__auto_doc__', None)
+    if render:
+        target.__doc__ = render()
+        del target.__auto_doc__
+        if obj is not target:
+            try:
+                obj.__doc__ = target.__doc__
+            except AttributeError:
+                pass
+    return obj.__doc__
+
+def auto_doc(heading_template=None, heading_level=2, lazy=None):
     """
     Decorator that preserves the original function docstring and
     appends auto-generated Markdown tables for parameters and return types.
     Optionally adds a heading template at the top.
 
+    With `lazy` (default `LAZY_DOCS`) nothing is parsed until `render_doc()`
+    asks for the docstring.
+
     This version:
     - Extracts inline comments for parameters and return values.
     - Falls back to reading the source file directly if inspect.getsource() fails.
@@ -103,7 +260,8 @@ def auto_doc(heading_template=None, heading_level=2):
 
         return param_comments, return_comment
 
-    def decorator(func):
+    def render(func):
+        """Build the Markdown docstring for `func`."""
         # Unwrap to reach the original underlying function if wrapped by another decorator
         real_func = inspect.unwrap(func)
 
@@ -168,16 +326,26 @@ def auto_doc(heading_template=None, heading_level=2):
         lines.append("--- | ---")
         lines.append(f"`{return_annot_str}` | {return_comment or ''}")
 
-        # Update the docstring on the real underlying function
-        real_func.__doc__ = "\n".join(lines)
+        return "\n".join(lines)
+
+    def decorator(func):
+        real_func = inspect.unwrap(func)
+        if LAZY_DOCS if lazy is None else lazy:
+            real_func.__auto_doc__ = lambda: cached_doc(real_func, lambda: render(real_func))
+            _PENDING_DOCS.append(real_func)
+        else:
+            # Update the docstring on the real underlying function
+            real_func.__doc__ = cached_doc(real_func, lambda: render(func))
 
         return func  # Return the outer function (so existing decorators still see it)
 
     return decorator
 
-def auto_class_doc(heading_template=None):
+def auto_class_doc(heading_template=None, lazy=None):
     """
     Decorator that auto-generates a Markdown-formatted docstring for a class.
+    With `lazy` (default `LAZY_DOCS`) it installs a `LazyDoc` that builds the
+    docstring the first time `__doc__` is read.
 
     Features:
     - Adds an optional heading template with version/date.
@@ -223,8 +391,14 @@ def auto_class_doc(heading_template=None):
                     param_comments[name] = comment.strip()
         return param_comments
 
-    def decorator(cls):
-        orig_doc = inspect.getdoc(cls) or ""
+    def render(cls, own_doc):
+        """Build the Markdown docstring for `cls`, whose own docstring was `own_doc`."""
+        # Same as `inspect.getdoc(cls)`, which can't be used once a `LazyDoc` is installed
+        if own_doc:
+            orig_doc = inspect.cleandoc(own_doc)
+        else:
+            orig_doc = next((inspect.getdoc(base) for base in cls.__mro__[1:]
+                             if base is not object and base.__doc__), "")
         lines = []
 
         # Optional heading
@@ -310,11 +484,19 @@ def auto_class_doc(heading_template=None):
 
             for name, m in methods:
                 sig = inspect.signature(m)
+                render_doc(m)
                 doc = inspect.getdoc(m)
                 desc = (doc.split("\n")[0] if doc else "")
                 lines.append(f"`{name}` | `{sig}` | {desc}")
 
-        cls.__doc__ = "\n".join(lines)
+        return "\n".join(lines)
+
+    def decorator(cls):
+        own_doc = cls.__dict__.get("__doc__")
+        if LAZY_DOCS if lazy is None else lazy:
+            cls.__doc__ = LazyDoc(lambda: cached_doc(cls, lambda: render(cls, own_doc)), own_doc)
+        else:
+            cls.__doc__ = cached_doc(cls, lambda: render(cls, own_doc))
         return cls
 
     return decorator
@@ -363,9 +545,9 @@ class Workshop:
         pass
 
 if __name__ == "__main__":
-    print(add.__doc__)
+    print(render_doc(add))
     print("\n" + "-" * 40 + "\n")
-    print(greet.__doc__)
+    print(render_doc(greet))
     print("\n" + "-" * 40 + "\n")
     print(Workshop.__doc__)
     import doctest
@@ -0,0 +1,31 @@
+"""
+Where the package keeps its on-disk caches, and how they are written.
+
+`CACHE_DIR` is the same directory as `where.USER_DATA_DIR / 'cache'`, but
+this module imports nothing from the package, so `_git_info` and `_auto_doc`
+can use it before `where` is importable.
+"""
+
+import os
+from pathlib import Path
+
+CACHE_DIR = Path.home() / f'.{__package__}' / 'cache'
+
+def write_atomic(path: Path, data: bytes | str) -> bool:
+    """
+    Write `data` to `path` through a temporary file in the same directory,
+    so readers see either the old file or the whole new one. Failing to
+    cache is not an error: returns False instead of raising `OSError`.
+    """
+    tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(data, str):
+            tmp.write_text(data)
+        else:
+            tmp.write_bytes(data)
+        os.replace(tmp, path)
+        return True
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        return False
@@ -0,0 +1,178 @@
+from datetime import datetime
+from functools import cache, cached_property
+from hashlib import sha1
+import json
+from pathlib import Path
+import subprocess
+import zlib
+
+from ._cache import CACHE_DIR, write_atomic
+from ._git_reader import commit_timestamp, config_value, find_git_dir, latest_tag, resolve_ref
+
+RECORD_SEP = '\x1e'
+READ_ERRORS = (OSError, ValueError, zlib.error)
+
+def find_repo_root(path: str | Path | None = None) -> Path | None:
+    """
+    Return the top-level directory of the git work tree containing `path`
+    (the current working directory by default), or None if there isn't one.
+    Only looks for a `.git` entry, so it never starts a process.
+    """
+    p = Path(path).resolve() if path else Path.cwd().resolve()
+    for d in (p, *p.parents):
+        if (d / '.git').exists():
+            return d
+    return None
+
+class GitInfo:
+    """
+    Memoized answers to the git questions the package asks while importing:
+    the remote URL, the time of the HEAD commit and the time of the last
+    commit that touched each file.
+
+    Each answer is computed at most once per process. The remote URL, the
+    HEAD commit and the latest tag are read straight from `.git` by
+    `_git_reader`; the `git` binary is only used when that fails and for the
+    per-file commit times, which all come out of a single
+    `git log --name-only` pass that is cached on disk until HEAD moves.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({str(self.root)!r})"
+
+    def git(self, *args: str) -> str | None:
+        """ Run `git` in the work tree and return its output, or None on failure. """
+        try:
+            result = subprocess.run(["git", "-C", str(self.root), *args],
+                                    capture_output=True, text=True, check=True)
+        except (subprocess.CalledProcessError, OSError):
+            return None
+        return result.stdout
+
+    @cached_property
+    def git_dir(self) -> Path | None:
+        return find_git_dir(self.root)
+
+    @cached_property
+    def remote_url(self) -> str | None:
+        if self.git_dir:
+            try:
+                return config_value(self.git_dir, "remote.origin.url")
+            except READ_ERRORS:
+                pass
+        out = self.git("config", "--get", "remote.origin.url")
+        return (out.strip() or None) if out else None
+
+    @cached_property
+    def head_sha(self) -> str | None:
+        if self.git_dir:
+            try:
+                return resolve_ref(self.git_dir)
+            except READ_ERRORS:
+                pass
+        out = self.git("rev-parse", "HEAD")
+        return (out.strip() or None) if out else None
+
+    @cached_property
+    def latest_tag(self) -> str | None:
+        if self.git_dir:
+            try:
+                return latest_tag(self.git_dir)
+            except READ_ERRORS:
+                pass
+        out = self.git("describe", "--tags", "--abbrev=0")
+        return (out.strip() or None) if out else None
+
+    @cached_property
+    def index_file(self) -> Path:
+        """ On-disk copy of `commit_index` for this work tree. """
+        return CACHE_DIR / f'git-index-{sha1(str(self.root).encode()).hexdigest()[:16]}.json'
+
+    @cached_property
+    def commit_index(self) -> tuple[int | None, dict[str, int]]:
+        """
+        `(HEAD commit timestamp, {path relative to root: last commit timestamp})`.
+
+        Loaded from `index_file` when it was built for the current HEAD,
+        otherwise rebuilt with one walk over the history and saved again.
+        """
+        head = self.head_sha
+        if head:
+            try:
+                data = json.loads(self.index_file.read_text())
+                if data['head'] == head:
+                    return data['head_time'], data['files']
+            except (OSError, ValueError, KeyError):
+                pass
+        index = self.build_commit_index()
+        if head and index[1]:
+            self.save_commit_index(head, index)
+        return index
+
+    def build_commit_index(self) -> tuple[int | None, dict[str, int]]:
+        """ Build `commit_index` from a single `git log --name-only` pass. """
+        out = self.git("-c", "core.quotepath=off", "log",
+                       f"--format={RECORD_SEP}%ct", "--name-only")
+        head = None
+        files = dict()
+        if not out:
+            return head, files
+        for record in out.split(RECORD_SEP)[1:]:
+            lines = record.split('\n')
+            ts = int(lines[0])
+            if head is None:
+                head = ts
+            for name in lines[1:]:
+                if name:
+                    files.setdefault(name, ts)
+        return head, files
+
+    def save_commit_index(self, head: str, index: tuple[int | None, dict[str, int]]):
+        """ Write `index` to `index_file` atomically; failing to cache is not an error. """
+        write_atomic(self.index_file, json.dumps({'head': head, 'head_time': index[0], 'files': index[1]}))
+
+    @cached_property
+    def head_timestamp(self) -> int | None:
+        if self.git_dir and self.head_sha:
+            try:
+                return commit_timestamp(self.git_dir, self.head_sha)
+            except READ_ERRORS:
+                pass
+        return self.commit_index[0]
+
+    def file_timestamp(self, path: str | Path) -> int | None:
+        """ Timestamp of the last commit touching `path` (a file or a directory). """
+        try:
+            rel = Path(path).resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+        files = self.commit_index[1]
+        if rel in files:
+            return files[rel]
+        if rel == '.':
+            return self.head_timestamp
+        prefix = rel + '/'
+        return max((ts for name, ts in files.items() if name.startswith(prefix)), default=None)
+
+@cache
+def _git_info(root: Path) -> GitInfo:
+    return GitInfo(root)
+
+def git_info(path: str | Path | None = None) -> GitInfo | None:
+    """ Return the shared `GitInfo` for the work tree containing `path`, if any. """
+    root = find_repo_root(path)
+    return _git_info(root) if root else None
+
+def _to_datetime(ts: int | None) -> datetime | None:
+    return datetime.fromtimestamp(ts) if ts is not None else None
+
+def head_datetime(path: str | Path | None = None) -> datetime | None:
+    info = git_info(path)
+    return _to_datetime(info.head_timestamp) if info else None
+
+def file_datetime(path: str | Path) -> datetime | None:
+    info = git_info(path)
+    return _to_datetime(info.file_timestamp(path)) if info else None
@@ -0,0 +1,308 @@
+"""
+Read the bits of a `.git` directory the package needs without running `git`:
+the config, `HEAD`, loose and packed refs, and commit and tag objects stored
+either loose or in version 2 pack files.
+
+Functions return None when something is simply absent (no remote, no tags)
+and raise `OSError`, `ValueError` or `zlib.error` when the repository cannot
+be read, so callers can fall back to the `git` binary.
+"""
+
+from functools import cache, lru_cache
+import heapq
+import mmap
+from pathlib import Path
+import re
+import zlib
+
+SECTION_RE = re.compile(r'^\[\s*([^\s\]"]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]')
+COMMITTER_RE = re.compile(rb'^committer .* (\d+) [+-]\d{4}$', re.MULTILINE)
+
+OBJ_COMMIT, OBJ_TREE, OBJ_BLOB, OBJ_TAG = 1, 2, 3, 4
+OBJ_OFS_DELTA, OBJ_REF_DELTA = 6, 7
+TYPE_NAMES = {OBJ_COMMIT: b'commit', OBJ_TREE: b'tree', OBJ_BLOB: b'blob', OBJ_TAG: b'tag'}
+
+# `latest_tag` gives up (ValueError) after this many commits; `git describe`
+# is faster than reading that much history one object at a time.
+MAX_WALK = 256
+COMMIT_CACHE_SIZE = 4096
+
+def find_git_dir(root: str | Path) -> Path | None:
+    """ Return the git directory of the work tree at `root`, following `gitdir:` files. """
+    dot_git = Path(root) / '.git'
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        line = dot_git.read_text().strip()
+        if line.startswith('gitdir:'):
+            p = Path(line.partition(':')[-1].strip())
+            return (p if p.is_absolute() else (Path(root) / p)).resolve()
+    return None
+
+def common_dir(git_dir: Path) -> Path:
+    """ The directory holding objects, refs and config (differs from `git_dir` in worktrees). """
+    f = git_dir / 'commondir'
+    if f.exists():
+        p = Path(f.read_text().strip())
+        return (p if p.is_absolute() else git_dir / p).resolve()
+    return git_dir
+
+# --- Config -----------------------------------------------------------------
+
+def read_config(git_dir: Path) -> dict[str, str]:
+    """ Parse `config` into a flat `{'section.subsection.key': value}` dict. """
+    values = dict()
+    section = ''
+    for line in (common_dir(git_dir) / 'config').read_text().splitlines():
+        line = line.strip()
+        if not line or line[0] in '#;':
+            continue
+        m = SECTION_RE.match(line)
+        if m:
+            name, sub = m.groups()
+            section = name.lower() + (f'.{sub}' if sub is not None else '')
+            continue
+        key, sep, value = line.partition('=')
+        value = value.strip() if sep else 'true'
+        if len(value) > 1 and value[0] == value[-1] == '"':
+            value = value[1:-1]
+        values[f'{section}.{key.strip().lower()}'] = value
+    return values
+
+def config_value(git_dir: Path, key: str) -> str | None:
+    return read_config(git_dir).get(key)
+
+# --- Refs -------------------------------------------------------------------
+
+def packed_refs(git_dir: Path) -> tuple[dict[str, str], dict[str, str]]:
+    """ Return `({ref: sha}, {ref: peeled commit sha})` from `packed-refs`. """
+    refs, peeled = dict(), dict()
+    f = common_dir(git_dir) / 'packed-refs'
+    if not f.exists():
+        return refs, peeled
+    last = None
+    for line in f.read_text().splitlines():
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('^'):
+            if last:
+                peeled[last] = line[1:].strip()
+            continue
+        sha, _, last = line.partition(' ')
+        refs[last] = sha
+    return refs, peeled
+
+def resolve_ref(git_dir: Path, ref: str = 'HEAD') -> str | None:
+    """ Follow symbolic refs until reaching a commit sha. """
+    for _ in range(10):
+        for d in (git_dir, common_dir(git_dir)):
+            f = d / ref
+            if f.is_file():
+                content = f.read_text().strip()
+                break
+        else:
+            return packed_refs(git_dir)[0].get(ref)
+        if not content.startswith('ref:'):
+            return content
+        ref = content.partition(':')[-1].strip()
+    raise ValueError(f'Symbolic ref loop at {ref}')
+
+def tag_refs(git_dir: Path) -> dict[str, str]:
+    """ Return `{tag name: sha}` for every loose and packed tag. """
+    refs, _ = packed_refs(git_dir)
+    tags = {r.removeprefix('refs/tags/'): sha for r, sha in refs.items() if r.startswith('refs/tags/')}
+    tags_dir = common_dir(git_dir) / 'refs' / 'tags'
+    if tags_dir.is_dir():
+        for f in tags_dir.rglob('*'):
+            if f.is_file():
+                tags[f.relative_to(tags_dir).as_posix()] = f.read_text().strip()
+    return tags
+
+# --- Objects ----------------------------------------------------------------
+
+def read_object(git_dir: Path, sha: str) -> tuple[bytes, bytes]:
+    """ Return `(type, body)` for the object `sha`, loose or packed. """
+    objects = common_dir(git_dir) / 'objects'
+    loose = objects / sha[:2] / sha[2:]
+    if loose.exists():
+        raw = zlib.decompress(loose.read_bytes())
+        header, _, body = raw.partition(b'\0')
+        return header.partition(b' ')[0], body
+    pack_dir = objects / 'pack'
+    try:
+        indexes = _pack_indexes(pack_dir, pack_dir.stat().st_mtime_ns)
+    except FileNotFoundError:
+        indexes = ()
+    for idx in indexes:
+        offset = _pack_offset(idx, bytes.fromhex(sha))
+        if offset is not None:
+            obj_type, body = _read_packed(git_dir, idx.with_suffix('.pack'), offset)
+            return TYPE_NAMES[obj_type], body
+    raise ValueError(f'Object {sha} not found')
+
+@lru_cache(maxsize=8)
+def _pack_indexes(pack_dir: Path, mtime_ns: int) -> tuple[Path, ...]:
+    """ The pack indexes in `pack_dir`, listed again when the directory changes. """
+    return tuple(pack_dir.glob('*.idx'))
+
+@cache
+def _mapped(path: Path) -> mmap.mmap:
+    """
+    A read-only map of a pack or pack index, made once per process. Packs
+    are never rewritten in place (a repack writes new files), so a map stays valid.
+    """
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _pack_offset(idx: Path, binsha: bytes) -> int | None:
+    """ Look `binsha` up in a version 2 pack index. """
+    data = _mapped(idx)
+    if data[:4] != b'\377tOc' or int.from_bytes(data[4:8], 'big') != 2:
+        raise ValueError(f'Unsupported pack index {idx}')
+    fanout = 8
+    lo = int.from_bytes(data[fanout + 4 * (binsha[0] - 1):fanout + 4 * binsha[0]], 'big') if binsha[0] else 0
+    hi = int.from_bytes(data[fanout + 4 * binsha[0]:fanout + 4 * binsha[0] + 4], 'big')
+    total = int.from_bytes(data[fanout + 1020:fanout + 1024], 'big')
+    names = fanout + 1024
+    while lo < hi:
+        mid = (lo + hi) // 2
+        name = data[names + 20 * mid:names + 20 * mid + 20]
+        if name < binsha:
+            lo = mid + 1
+        elif name > binsha:
+            hi = mid
+        else:
+            offsets = names + 20 * total + 4 * total
+            offset = int.from_bytes(data[offsets + 4 * mid:offsets + 4 * mid + 4], 'big')
+            if offset & 0x80000000:
+                large = offsets + 4 * total + 8 * (offset & 0x7fffffff)
+                offset = int.from_bytes(data[large:large + 8], 'big')
+            return offset
+    return None
+
+def _read_packed(git_dir: Path, pack: Path, offset: int) -> tuple[int, bytes]:
+    data = _mapped(pack)
+    i = offset
+    byte = data[i]
+    i += 1
+    obj_type = (byte >> 4) & 7
+    while byte & 0x80:
+        byte = data[i]
+        i += 1
+    if obj_type == OBJ_OFS_DELTA:
+        byte = data[i]
+        i += 1
+        rel = byte & 0x7f
+        while byte & 0x80:
+            byte = data[i]
+            i += 1
+            rel = ((rel + 1) << 7) | (byte & 0x7f)
+        base_type, base = _read_packed(git_dir, pack, offset - rel)
+    elif obj_type == OBJ_REF_DELTA:
+        base_name, base = read_object(git_dir, data[i:i + 20].hex())
+        base_type = {v: k for k, v in TYPE_NAMES.items()}[base_name]
+        i += 20
+    d = zlib.decompressobj()
+    body = b''
+    while not d.eof and i < len(data):
+        body += d.decompress(data[i:i + 4096])
+        i += 4096
+    if obj_type in (OBJ_OFS_DELTA, OBJ_REF_DELTA):
+        return base_type, _apply_delta(base, body)
+    return obj_type, body
+
+def _apply_delta(base: bytes, delta: bytes) -> bytes:
+    def varint(i):
+        value = shift = 0
+        while True:
+            byte = delta[i]
+            i += 1
+            value |= (byte & 0x7f) << shift
+            shift += 7
+            if not byte & 0x80:
+                return value, i
+    _, i = varint(0)
+    _, i = varint(i)
+    out = bytearray()
+    while i < len(delta):
+        op = delta[i]
+        i += 1
+        if op & 0x80:
+            offset = size = 0
+            for n in range(4):
+                if op & (1 << n):
+                    offset |= delta[i] << (8 * n)
+                    i += 1
+            for n in range(3):
+                if op & (1 << (4 + n)):
+                    size |= delta[i] << (8 * n)
+                    i += 1
+            out += base[offset:offset + (size or 0x10000)]
+        elif op:
+            out += delta[i:i + op]
+            i += op
+        else:
+            raise ValueError('Invalid delta opcode')
+    return bytes(out)
+
+# --- Commits and tags -------------------------------------------------------
+
+def peel(git_dir: Path, sha: str) -> str:
+    """ Follow annotated tag objects down to the commit they point at. """
+    obj_type, body = read_object(git_dir, sha)
+    while obj_type == b'tag':
+        sha = body.split(b'\n', 1)[0].partition(b' ')[-1].decode()
+        obj_type, body = read_object(git_dir, sha)
+    return sha
+
+@lru_cache(maxsize=COMMIT_CACHE_SIZE)
+def _commit(git_dir: Path, sha: str) -> tuple[int, tuple[str, ...]]:
+    """ `(committer timestamp, parents)` of commit `sha`; commits never change, so it's kept. """
+    _, body = read_object(git_dir, sha)
+    m = COMMITTER_RE.search(body)
+    if not m:
+        raise ValueError(f'Commit {sha} has no committer line')
+    return int(m.group(1)), tuple(commit_parents(body))
+
+def commit_timestamp(git_dir: Path, sha: str) -> int:
+    """ The committer timestamp of commit `sha`. """
+    return _commit(git_dir, sha)[0]
+
+def commit_parents(body: bytes) -> list[str]:
+    parents = list()
+    for line in body.split(b'\n\n', 1)[0].split(b'\n'):
+        if line.startswith(b'parent '):
+            parents.append(line[7:].decode())
+    return parents
+
+def latest_tag(git_dir: Path, rev: str = 'HEAD', max_commits: int = MAX_WALK) -> str | None:
+    """
+    Return the most recent tag reachable from `rev`, like
+    `git describe --tags --abbrev=0`, or None if there isn't one. Raises
+    `ValueError` rather than read more than `max_commits` commits.
+    """
+    tags = tag_refs(git_dir)
+    if not tags:
+        return None
+    _, peeled = packed_refs(git_dir)
+    tagged = dict()
+    for name, sha in tags.items():
+        commit = peeled.get(f'refs/tags/{name}') or peel(git_dir, sha)
+        tagged.setdefault(commit, name)
+    start = resolve_ref(git_dir, rev)
+    if not start:
+        return None
+    # Walk the history newest first, stopping at the first tagged commit.
+    heap = [(-commit_timestamp(git_dir, start), start)]
+    seen = {start}
+    while heap:
+        _, sha = heapq.heappop(heap)
+        if sha in tagged:
+            return tagged[sha]
+        if len(seen) > max_commits:
+            raise ValueError(f'No tag within {max_commits} commits of {rev}')
+        for parent in _commit(git_dir, sha)[1]:
+            if parent not in seen:
+                seen.add(parent)
+                heapq.heappush(heap, (-commit_timestamp(git_dir, parent), parent))
+    return None
@@ -1,25 +1,21 @@
 import re
 import subprocess
 
+from ._git_info import git_info
+
 def get_upstream_url():
-    try:
-        # This gets the URL of the 'origin' remote
-        result = subprocess.run(
-            ["git", "config", "--get", "remote.origin.url"],
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        url = result.stdout.strip()
-
-        # Convert a ssh link to a http link
-        if url.startswith('git@'):
-            url = 'https://' + re.sub(':', '/', url.partition('@')[-1])
-        
-        return url if url else None
-    except subprocess.CalledProcessError:
+    # This gets the URL of the 'origin' remote, asking git at most once per process
+    info = git_info()
+    url = info.remote_url if info else None
+    if not url:
         return None
 
+    # Convert a ssh link to a http link
+    if url.startswith('git@'):
+        url = 'https://' + re.sub(':', '/', url.partition('@')[-1])
+
+    return url
+
 # url = get_upstream_url()
 # print(url)
 
@@ -34,31 +34,49 @@
 # """
 
 from importlib import import_module, resources
-import inspect
 import os
 from pathlib import Path
 import runpy
 import sys
 import traceback
+from types import ModuleType
+from typing import Optional, Tuple, Union
+
+# Absolute filename -> name of the first module in `sys.modules` loaded from it.
+_MODULE_FILES: dict[str, str] = dict()
+_INDEXED_NAMES: set[str] = set()
+
+def _index_modules():
+    """ Add any modules imported since the last call to `_MODULE_FILES`. """
+    for name in [n for n in sys.modules if n not in _INDEXED_NAMES]:
+        _INDEXED_NAMES.add(name)
+        module = sys.modules.get(name)
+        file = getattr(module, '__file__', None)
+        if file:
+            _MODULE_FILES.setdefault(os.path.abspath(file), name)
+
+def module_name_for_file(filename: str) -> str | None:
+    """ Return the name of the loaded module whose source is `filename`, if any. """
+    filename = os.path.abspath(filename)
+    if filename not in _MODULE_FILES:
+        _index_modules()
+    return _MODULE_FILES.get(filename)
 
 def import_chain():
-    stack = inspect.stack()
     chain = []
 
-    for frame_info in stack:
-        filename = frame_info.filename
+    # Walk the raw frames; `inspect.stack()` would also read source lines for each one.
+    frame = sys._getframe(1)
+    while frame:
+        filename = frame.f_code.co_filename
+        frame = frame.f_back
 
         # Skip frames from Python internals or this module itself
         if filename.startswith("<") or filename == __file__:
             continue
 
         # Try to map filename back to a module/package name
-        module_name = None
-        for name, module in sys.modules.items():
-            if hasattr(module, '__file__') and module.__file__:
-                if os.path.abspath(module.__file__) == os.path.abspath(filename):
-                    module_name = name
-                    break
+        module_name = module_name_for_file(filename)
         if module_name is None:
             module_name = os.path.splitext(os.path.basename(filename))[0]
 
@@ -37,15 +37,67 @@ details here.
 from argparse import ArgumentParser as AP
 from collections import namedtuple
 import csv
+from hashlib import sha1
+import pickle
+import shlex
 import sys
 
 # import pandas as pd
 
-from .interpreters import RUNNING_CLI
+from ._cache import CACHE_DIR, write_atomic
+from .interpreters import RUNNING_CLI, RUNNING_GATEWAY
 from .where import PROJ_DATA
 
 EPILOG = (PROJ_DATA / 'epilog.txt').read_text()
 
+_compiled = dict()  # {csv path: (mtime, size, options)} for this process
+
+def read_args_csv(p:Path)->list[list[list|dict]]:
+    """ Parse an options CSV into `[[flags], {add_argument keyword arguments}]` pairs. """
+    result = list()
+    with open(p, newline='') as f:
+        reader = csv.DictReader(f)
+        columns = reader.fieldnames
+        Row = namedtuple("Row", columns)
+        rows = [Row(**row) for row in reader]
+        for r in rows:
+            L = list()
+            L2 = list()
+            if r.short: L2.append(r.short)
+            if r.long:  L2.append(r.long)
+            L.append(L2)
+            D = dict()
+            for s in columns[2:]:
+                value = getattr(r, s)
+                if value:
+                    D[s] = value
+            L.append(D)
+            result.append(L)
+    return result
+
+def compiled_args(p:Path)->list[list[list|dict]]:
+    """
+    Return `read_args_csv(p)`, from memory or from the pickle in
+    `CACHE_DIR` as long as the CSV's mtime and size haven't changed.
+    """
+    st = p.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    if p in _compiled and _compiled[p][:2] == key:
+        return _compiled[p][2]
+    cache_file = CACHE_DIR / f'opts-{p.stem}-{sha1(str(p.resolve()).encode()).hexdigest()[:16]}.pkl'
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = pickle.load(f)
+        if cached['key'] == key:
+            _compiled[p] = (*key, cached['options'])
+            return cached['options']
+    except (OSError, EOFError, pickle.UnpicklingError, KeyError, TypeError):
+        pass
+    options = read_args_csv(p)
+    write_atomic(cache_file, pickle.dumps({'key': key, 'options': options}))
+    _compiled[p] = (*key, options)
+    return options
+
 @auto_doc("Look for options and arguments in a CSV file.")
 def get_args(p:Path|str)->list[list[list|dict]]|None:
     """
@@ -74,26 +126,15 @@ def get_args(p:Path|str)->list[list[list|dict]]|None:
         with open(p, 'rb') as f:  # 'rb' = read binary
             return pickle.load(f)
 
-    result = list()
-    with open(p, newline='') as f:
-        reader = csv.DictReader(f)
-        columns = reader.fieldnames
-        Row = namedtuple("Row", columns)
-        rows = [Row(**row) for row in reader]
-        for r in rows:
-            L = list()
-            L2 = list()
-            if r.short: L2.append(r.short)
-            if r.long:  L2.append(r.long)
-            L.append(L2)
-            D = dict()
-            for s in columns[2:]:
-                value = getattr(r, s)
-                if value:
-                    D[s] = value
-            L.append(D)
-            result.append(L)
-    return result
+    # Callers append to the list, so they get their own copy.
+    return [[list(flags), dict(kwargs)] for flags, kwargs in compiled_args(p)]
+
+@auto_doc("Build an `ArgumentParser` from options returned by `get_args`.")
+def build_parser(options:list[list[list|dict]], prog:str, description:str='', epilog:str='')->AP:
+    ap = AP(prog=prog, description=description, epilog=epilog)
+    for option in options:
+        ap.add_argument(*option[0], **option[1])
+    return ap
 
 @auto_doc()
 def parse_arguments(arg_file:Path|str,
@@ -108,9 +149,7 @@ def parse_arguments(arg_file:Path|str,
                       "help": "Display the program name and version, then exit."}])
 
 
-    ap = AP(prog=program_name, description=description, epilog=epilog)
-    for option in STD_OPTS:
-        ap.add_argument(*option[0], **option[1])
+    ap = build_parser(STD_OPTS, program_name, description, epilog)
 
     if RUNNING_CLI:
         return ap.parse_args(sys.argv[1:])
@@ -34,25 +34,114 @@ details here.
 
 """
 
-from configparser import ConfigParser as CP
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from hashlib import sha1
+import marshal
+import os
 from pathlib import Path
+import re
 
+from ._cache import CACHE_DIR, write_atomic
 from .arguments import parse_arguments
 from .constants import NEWLINE
 from .picts import WARNING_PICT
 from .stdinput import get_piped_input
 from .where import USER_PREFS_DIR
 
+# One match per line, after its indentation: a blank or comment line, a
+# section header, a `key = value` (or `key: value`) pair, or anything else,
+# which is ignored. Whether a line continues the previous value depends on
+# its indentation, so `parse_config` decides that.
+CONFIG_LINE_RE = re.compile(r'''
+    ^(?P<indent>[ \t]*)
+    (?: (?P<comment>[\#;].*)?
+      | \[(?P<section>[^\n]+)\]
+      | (?P<key>[^=:\n]*?)[ \t]*[=:][ \t]*(?P<value>.*?)
+      | .+?
+    )[ \t]*$
+''', re.MULTILINE | re.VERBOSE)
+
+# `key = value` files without sections: `=` is the only delimiter, `#`
+# starts a comment anywhere on a line and every line stands alone.
+SIMPLE_LINE_RE = re.compile(r'^[^\S\n]*(?P<key>[^=#\n]*?)[^\S\n]*=[^\S\n]*(?P<value>[^#\n]*?)[^\S\n]*(?:#.*)?$',
+                            re.MULTILINE)
+
+def parse_config(text: str, lower_keys: bool = True) -> dict[str, dict[str, str]]:
+    """
+    Split the text of an INI-style file into `{section: {key: value}}` the
+    way `ConfigParser` reads it (without `%(name)s` interpolation). Keys
+    before the first section go to `'DEFAULT'`. Lines starting with `#` or
+    `;` are comments, and a line indented deeper than its key continues
+    that key's value, blank lines in between included.
+    """
+    sections = {'DEFAULT': dict()}
+    current = sections['DEFAULT']
+    key = None
+    key_indent = 0
+    blanks = 0
+    for m in CONFIG_LINE_RE.finditer(text):
+        line = m.group().strip()
+        if m.group('comment') is not None:
+            continue  # comments don't end a value
+        if not line:
+            blanks += key is not None
+            continue
+        indent = len(m.group('indent'))
+        if key is not None and indent > key_indent:
+            current[key] += '\n' * (blanks + 1) + line
+            blanks = 0
+            continue
+        blanks = 0
+        section, k, value = m.group('section', 'key', 'value')
+        if section is not None:
+            current = sections.setdefault(section, dict())
+            key = None
+        elif k is not None:
+            key = k.lower() if lower_keys else k
+            key_indent = indent
+            current[key] = value
+        else:
+            key = None
+    return sections
+
+def merge_config(into: dict[str, dict[str, str]], other: dict[str, dict[str, str]]) -> dict[str, dict[str, str]]:
+    """ Add the sections and keys of `other` to `into`, `other` winning. """
+    for section, values in other.items():
+        into.setdefault(section, dict()).update(values)
+    return into
+
+def flat_config(text: str) -> dict[str, str]:
+    """
+    Read a simple `*.cfg` file: one `key = value` per line, keys as written,
+    `#` comments anywhere, and lines without `=` (section headers included)
+    ignored. Unlike `parse_config`, `:` isn't a delimiter and indented lines
+    don't continue a value.
+    """
+    return {m.group('key'): m.group('value') for m in SIMPLE_LINE_RE.finditer(text)}
+
+def load_configs(paths, max_workers: int | None = None, **kwargs) -> dict[Path, dict[str, dict[str, str]]]:
+    """
+    Read and parse many config files at once in a thread pool, for example
+    `load_configs(Path(project).rglob('*.cfg'))`. Returns
+    `{path: parse_config(text, **kwargs)}` in the order given; files that
+    can't be read are left out.
+    """
+    def load(p: Path):
+        try:
+            return parse_config(p.read_text(), **kwargs)
+        except OSError:
+            return None
+
+    paths = [Path(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return {p: parsed for p, parsed in zip(paths, pool.map(load, paths)) if parsed is not None}
+
 def config(p:str|Path)->dict:
     """ Simple function to just read a `*.cfg` file with no sections. """
     p = Path(p)
     lines = read_lines(p)
-    d = dict()
-    for l in lines:
-        k, _, v = l.partition('=')
-        v = v.partition('#')[0]
-        d[k.strip()] = v.strip()
-    return d
+    return flat_config(NEWLINE.join(lines)) if lines is not None else dict()
 
 class Configuration():
     def __init__(self, files:list):
@@ -66,22 +155,29 @@ class Configuration():
         else:
             raise TypeError(f"files must be str, Path, or list of str/Path, got {type(files)}")
 
-        self.config = CP()
-        if files_list:
-            for f in files_list:
-                try:
-                    lines = Path(f).read_text().splitlines()
-                except FileNotFoundError:
-                    print(f'{WARNING_PICT}Configuration file not found: {f}')
-                    break
-                if not lines[0].startswith('DEFAULT'):
-                    lines.insert(0, '[DEFAULT]')
-                self.config.read_string(NEWLINE.join(lines))
-            # self.config.read(files)
+        self.sections = {'DEFAULT': dict()}
+        for f in files_list:
+            try:
+                text = Path(f).read_text()
+            except FileNotFoundError:
+                print(f'{WARNING_PICT}Configuration file not found: {f}')
+                break
+            merge_config(self.sections, parse_config(text))
+
+    @cached_property
+    def config(self):
+        """ The same values as a `ConfigParser`, for code that wants one. """
+        from configparser import ConfigParser as CP
+
+        cp = CP()
+        cp.read_dict(self.sections)
+        return cp
 
     def as_dict(self) -> dict:
-        result = {'DEFAULT': dict(self.config.defaults())}
-        result.update({section: dict(self.config[section]) for section in self.config.sections()})
+        defaults = self.sections['DEFAULT']
+        result = {'DEFAULT': dict(defaults)}
+        result.update({section: {**defaults, **values}
+                       for section, values in self.sections.items() if section != 'DEFAULT'})
         return result
 
 def configure(files:list|None=None):
@@ -95,7 +191,39 @@ def configure(files:list|None=None):
 
 # {pformat(config.as_dict())}
 # ''')
-    return Configuration(files)
+    return config
+
+def _config_key(files: list) -> list | None:
+    """ `[path, size, mtime]` for each file, or None if one of them is missing. """
+    key = list()
+    for f in files:
+        try:
+            st = os.stat(f)
+        except OSError:
+            return None
+        key.append([str(f), st.st_size, st.st_mtime_ns])
+    return key
+
+def config_snapshot(files: list) -> dict[str, dict[str, str]]:
+    """
+    Return `Configuration(files).as_dict()`, from a marshalled snapshot in
+    `CACHE_DIR` when none of the files changed size or mtime since it
+    was written, so a warm start doesn't run `ConfigParser` at all.
+    """
+    files = [str(f) for f in files]
+    key = _config_key(files)
+    if key is None:
+        return Configuration(files).as_dict()
+    cache_file = CACHE_DIR / f"config-{sha1(chr(0).join(files).encode()).hexdigest()[:16]}.marshal"
+    try:
+        cached = marshal.loads(cache_file.read_bytes())
+        if cached['key'] == key:
+            return cached['config']
+    except (OSError, EOFError, ValueError, TypeError, KeyError):
+        pass
+    config = Configuration(files).as_dict()
+    write_atomic(cache_file, marshal.dumps({'key': key, 'config': config}))
+    return config
     
 @auto_doc()
 def get_user_pref(name: str # Key name to look for in the config file.
@@ -38,6 +38,7 @@ details here.
 import argparse
 from argparse import ArgumentParser as AP
 from cmd import Cmd
+from functools import lru_cache
 import logging
 from pathlib import Path
 from pprint import pp
@@ -47,20 +48,46 @@ from types import SimpleNamespace
 
 from rich import print as rp
 
-from pygnition.arguments import get_args
-from pygnition.configure import configure
+from pygnition.arguments import build_parser, get_args
+from pygnition.configure import config_snapshot
 # from pygnition.constants import EPILOG
-from pygnition.environment import Environment
-from pygnition.lumberjack import debug, error, info, stop, warn
+from pygnition.environment import ENVIRONMENT, Environment
+from pygnition.lumberjack import COMMAND_NAME, debug, error, info, stop, warn
 from pygnition.program import Program
-from pygnition.settings import Settings, SETTINGS
+from pygnition.layers import LayeredNamespace
+from pygnition.settings import Settings, split_options
 from pygnition.tools import chk_cmd, run_cmd
 from pygnition.where import PROJ_DATA, USER_PREFS_DIR
 
+COMMAND_CACHE_SIZE = 64
+
+def _mtime(p: Path) -> int | None:
+    try:
+        return p.stat().st_mtime_ns
+    except OSError:
+        return None
+
+@lru_cache(maxsize=COMMAND_CACHE_SIZE)
+def _command_setup(name: str, config_file: Path, opts_file: Path, env_prefix: str,
+                   config_mtime: int | None, opts_mtime: int | None, env_version: int) -> SimpleNamespace:
+    """
+    The parsed config, the argument parser and the environment slice for a
+    command. The mtimes and the environment version are only there to key
+    the cache: when one changes, the setup is built again.
+    """
+    if opts_mtime is None:
+        warn(f'File {str(opts_file)} is missing.')
+        opts_file = opts_file.with_name('std_opts.csv')
+    options = get_args(opts_file) if opts_file.exists() else list()
+    return SimpleNamespace(
+        config=config_snapshot([config_file])['DEFAULT'] if config_mtime is not None else dict(),
+        parser=build_parser(options, name, '', (PROJ_DATA / 'epilog.txt').read_text().strip()),
+        env=Environment(env_prefix))
+
 
 class Driver(Cmd, Program):
 
-    class Command(SimpleNamespace):
+    class Command(LayeredNamespace):
         @auto_doc("Initialize the `Command` object.")
         def __init__(self, name, *args, **kwargs):
             # self.driver = driver
@@ -97,25 +124,18 @@ class Driver(Cmd, Program):
         print()
         self.prompt = f"[{self.program_name}]: "
 
+    @auto_doc("Return the cached config, argument parser and environment for a command.")
+    def command_setup(self, name:str)->SimpleNamespace:
+        config_file = USER_PREFS_DIR / f'etc/{name}.cfg'
+        opts_file = self.app_dir / 'data' / f'{name}_opts.csv'
+        ENVIRONMENT.refresh()
+        return _command_setup(name, config_file, opts_file,
+                              self.program_name.upper() + '_' + name.upper() + '_',
+                              _mtime(config_file), _mtime(opts_file), ENVIRONMENT.version)
+
     @auto_doc("Parse the command line as if it were actually a command line.")
     def get_opts(self, name:str, line:str)->argparse.Namespace|None:
-        line = shlex.split(line)
-        OPTS_FILE = self.app_dir / 'data' / f'{name}_opts.csv'
-        print(f'{OPTS_FILE=}')
-        if not OPTS_FILE.exists():
-            warn(f'File {str(OPTS_FILE)} is missing.')
-            OPTS_FILE = self.app_dir / 'data' / 'std_opts.csv'
-        options = list()
-        if OPTS_FILE.exists():
-            options = get_args(OPTS_FILE)
-        ap = AP(prog=name,
-                description='',
-                epilog=(PROJ_DATA / 'epilog.txt').read_text().strip())
-
-        for opt in options:
-            ap.add_argument(*opt[0], **opt[1])
-
-        return ap.parse_args(line)
+        return self.command_setup(name).parser.parse_args(shlex.split(line))
 
     def command(self, name:str, line:str):
         debug(f'''Doing command.
@@ -123,21 +143,21 @@ class Driver(Cmd, Program):
 {line=}
 {self.__class__.__name__=}
 ''')
-        settings = dict()
-        config = None
-        config_file = USER_PREFS_DIR / f'etc/{name}.cfg'
-        if config_file.exists():
-            config = configure([config_file])
-            if config:
-                settings.update(dict(config.config['DEFAULT']))
-        settings.update(Environment(self.program_name.upper() + '_' + name.upper() + '_'))
-        options = self.get_opts(name, line)
-        if options: settings.update(vars(options))
+        setup = self.command_setup(name)
+        given, defaults = split_options(setup.parser.parse_args(shlex.split(line)))
+        # The command's own layers go around the driver's, which are shared, not copied.
+        layers = self._layers.with_layers(
+            top=[('command cli', given),
+                 ('command env', setup.env),
+                 ('command cfg', setup.config)],
+            bottom=[('command cli defaults', defaults)])
         # self.log = logging.getLogger(self.name)
 
-        # pp(settings)
-        
-        getattr(self, f'{name.title()}')(name, driver=self, **settings).run()
+        token = COMMAND_NAME.set(name)
+        try:
+            getattr(self, f'{name.title()}')(name, driver=self, layers=layers).run()
+        finally:
+            COMMAND_NAME.reset(token)
 
     @property
     def current_cmd(self):
@@ -152,6 +172,7 @@ class Driver(Cmd, Program):
         del self._current_cmd
 
     def run(self):
+        self.watch()
         super().cmdloop()
 
     def do_quit(self, args):
@@ -34,24 +34,48 @@ details here.
 
 """
 
+from bisect import bisect_left
 import os
 from pprint import pformat
 
 # from ._metadata import PACKAGE_NAME as PROJECT_NAME
 from .utils import *
 
+class EnvironmentSnapshot:
+    """
+    The names in `os.environ`, sorted so that all the names starting with a
+    prefix are one slice. Rebuilt only when `os.environ` has changed.
+    """
+    def __init__(self):
+        self._raw = None
+        self.keys = list()
+        self.version = 0  # Incremented on every rebuild, for caches built on top.
+
+    def refresh(self):
+        # `_data` is the plain dict behind `os.environ`; comparing it is one C-level call.
+        raw = getattr(os.environ, '_data', os.environ)
+        if raw != self._raw:
+            self._raw = dict(raw)
+            self.keys = sorted(os.environ)
+            self.version += 1
+
+    def with_prefix(self, prefix: str) -> list[str]:
+        """ The names in `os.environ` that start with `prefix`. """
+        self.refresh()
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + '\U0010ffff', lo)
+        return self.keys[lo:hi]
+
+ENVIRONMENT = EnvironmentSnapshot()
+
 class Environment(dict):
     @auto_doc(AUTO_DOC_HEAD)
     def __init__(self, prefix=PACKAGE_NAME.upper()+'_', *args, **kwargs):
-        super().__init__(self, *args, **kwargs)
-        
-        KEYS = grep(prefix, os.environ.keys())
-
-        # ENV = dict()
+        super().__init__(*args, **kwargs)
 
-        for k in KEYS:
+        for k in ENVIRONMENT.with_prefix(prefix):
             # print(f'$ENVIRONMENT_LOGFILE: {os.environ["ENVIRONMENT_LOGFILE"]}')
-            self[k.lstrip(prefix).lower()] = os.environ[k]
+            self[k.removeprefix(prefix).lower()] = os.environ[k]
 
     def dumps(self):
         return pformat(self)
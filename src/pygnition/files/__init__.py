@@ -6,6 +6,7 @@ from .._auto_doc import auto_class_doc, auto_doc, AUTO_DOC_HEAD
 from .._imports import import_chain
 
 PACKAGE_NAME = import_chain()[0]
+_FILES_PACKAGE = __name__  # `__name__` is replaced by the `_metadata` update below
 
 try:
     _metadata = import_module(f'{PACKAGE_NAME}._metadata')
@@ -50,43 +51,58 @@ Check the package [reference documentation](docs/markdown/index.md) for details.
 
 """
 
-from pygnition.files.files import File
-from pygnition.files.pyfiles import PyFile
-
-from pygnition.files.datafile import DataFile
-from pygnition.files.textfile import TextFile
-from pygnition.files.binaryfile import BinaryFile
-from pygnition.files.folders import Folder, WebSiteFolder
-from pygnition.files.picklefile import PickleFile
-from pygnition.files.jsonfile import JSONFile
-from pygnition.files.csvfile import CSVFile
-from pygnition.files.imagefile import ImageFile
-from pygnition.files.pngfile import PNGFile
-from pygnition.files.jpegfile import JPEGFile
-
-from pygnition.files.giffile import GIFFile
-
-from pygnition.files.videofile import VideoFile
-from pygnition.files.mp4file import MP4File
-from pygnition.files.avifile import AVIFile
-from pygnition.files.mkvfile import MKVFile
-from pygnition.files.audiofile import AudioFile
-from pygnition.files.mp3file import MP3File
-from pygnition.files.wavfile import WAVFile
-from pygnition.files.flacfile import FLACFile
-from pygnition.files.archivefile import ArchiveFile
-from pygnition.files.configfile import ConfigFile
-from pygnition.files.databasefile import DatabaseFile
-from pygnition.files.logfile import LogFile
-from pygnition.files.htmlfile import HTMLFile
-from pygnition.files.jsfile import JSFile
-from pygnition.files.cssfile import CSSFile
-from pygnition.files.cgifile import CGIFile
-from pygnition.files.scriptfile import ScriptFile
-from pygnition.files.executablefile import ExecutableFile
-from pygnition.files.specialfile import SpecialFile
-from pygnition.files.fifofile import FIFOFile
-from pygnition.files.socketfile import SocketFile
-from pygnition.files.symlink import SymbolicLink
-from pygnition.files.hardlink import HardLink
-from pygnition.files.mountpoint import MountPoint
+# Classes are imported from their modules the first time they are used
+# (PEP 562), so `import pygnition.files` doesn't load `magic`, `rich` or
+# every file type module up front.
+_EXPORTS = {
+    'File': 'files',
+    'PyFile': 'pyfiles',
+    'DataFile': 'datafile',
+    'TextFile': 'textfile',
+    'BinaryFile': 'binaryfile',
+    'Folder': 'folders',
+    'WebSiteFolder': 'folders',
+    'PickleFile': 'picklefile',
+    'JSONFile': 'jsonfile',
+    'CSVFile': 'csvfile',
+    'ImageFile': 'imagefile',
+    'PNGFile': 'pngfile',
+    'JPEGFile': 'jpegfile',
+    'GIFFile': 'giffile',
+    'VideoFile': 'videofile',
+    'MP4File': 'mp4file',
+    'AVIFile': 'avifile',
+    'MKVFile': 'mkvfile',
+    'AudioFile': 'audiofile',
+    'MP3File': 'mp3file',
+    'WAVFile': 'wavfile',
+    'FLACFile': 'flacfile',
+    'ArchiveFile': 'archivefile',
+    'ConfigFile': 'configfile',
+    'DatabaseFile': 'databasefile',
+    'LogFile': 'logfile',
+    'HTMLFile': 'htmlfile',
+    'JSFile': 'jsfile',
+    'CSSFile': 'cssfile',
+    'CGIFile': 'cgifile',
+    'ScriptFile': 'scriptfile',
+    'ExecutableFile': 'executablefile',
+    'SpecialFile': 'specialfile',
+    'FIFOFile': 'fifofile',
+    'SocketFile': 'socketfile',
+    'SymbolicLink': 'symlink',
+    'HardLink': 'hardlink',
+    'MountPoint': 'mountpoint',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {_FILES_PACKAGE!r} has no attribute {name!r}")
+    value = getattr(import_module(f'.{_EXPORTS[name]}', _FILES_PACKAGE), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -36,6 +36,7 @@ details here.
 
 # from functools import partial
 import getpass
+from importlib import import_module
 from io import StringIO
 import mimetypes
 import os
@@ -45,24 +46,29 @@ import subprocess
 import sys
 import tempfile
 
-import magic
-from rich import print as rp
-
-# from ._metadata import PROJECT_NAME
-# from .folders import Folder
-from ..gui_tools import choose_file, zenity_available
-from ..lumberjack import debug, error, info, stop, warn
-from ..tools import cd, cwd, run_cmd
-from ..where import cwd_mover
+# `magic` and `rich` are imported where they are used, so importing a
+# single file type doesn't pay for them.
 
 PROGRAM_NAME = PACKAGE_NAME
 
+# Modules whose classes register themselves with the `File` factory.
+REGISTRY_MODULES = ('folders', 'textfiles', 'pyfiles', 'jsonfile', 'giffile')
+
 # --- Base File Factory ---
 @auto_class_doc(AUTO_DOC_HEAD)
 class File:
     _mime_registry: dict[str, type] = {}
     _ext_registry: dict[str, type] = {}
     _folder_registry: list[tuple[type, callable]] = []
+    _registry_loaded: bool = False
+
+    @classmethod
+    def _load_registry(cls):
+        """ Import the modules that fill the registries, once, on first use of the factory. """
+        if not File._registry_loaded:
+            File._registry_loaded = True
+            for name in REGISTRY_MODULES:
+                import_module(f'.{name}', __package__)
 
     @auto_doc(AUTO_DOC_HEAD)
     def __new__(cls, p: str | Path | None = None):
@@ -71,6 +77,7 @@ class File:
         if p is None:
             return super().__new__(cls)
 
+        cls._load_registry()
         path = Path(p)
 
         # --- Folder detection ---
@@ -190,6 +197,8 @@ class File:
         :param mime: If True, return MIME type (e.g., 'image/png')
         :param encoding: If True, return encoding info (e.g., 'utf-8')
         """
+        import magic
+
         if mime:
             ms = magic.Magic(mime=True)
         elif encoding:
@@ -223,6 +232,9 @@ class MissingPath(File):
 
 if __name__ == '__main__':
     print(f"Running {Path(__file__).name}")
+    from rich import print as rp
+
+    from ..lumberjack import debug
     from ..where import DEBUG, TESTING
     print(f'{TESTING=}')
     print(f'{DEBUG=}')
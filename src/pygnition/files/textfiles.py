@@ -34,6 +34,7 @@ details here.
 
 """
 
+from ..configure import flat_config
 from .files import File
 from .folders import Folder
 from ..where import cwd_mover
@@ -54,17 +55,9 @@ class ConfigFile(TextFile):
     """Simple key=value config file handler."""
     
     def read(self) -> dict[str, str]:
-        data = {}
         if not self.path or not self.path.exists(): 
-            return data
-        for line in self.path.read_text().splitlines():
-            line = line.split('#', 1)[0].strip()  # strip comments
-            if not line: 
-                continue
-            key, sep, value = line.partition('=')
-            if sep:
-                data[key.strip()] = value.strip()
-        return data
+            return {}
+        return flat_config(self.path.read_text())
 
     def write(self, data: dict[str, str]):
         lines = [f"{k} = {v}" for k, v in data.items()]
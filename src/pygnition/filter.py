@@ -66,7 +66,7 @@ class Filter(Program):
         if self.verbose: print(f"{GEAR_PICT}Processing {str(p)} ...")
             
         if not p.exists():
-            warn(f"File {str(p)} does not exist!")
+            warn("File %s does not exist!", p)
             return
             
         if is_hidden(p) and not self.all:
@@ -75,19 +75,19 @@ class Filter(Program):
             return
 
         if p.is_block_device():
-            info(f'Skipping block device: {p.name}')
+            info('Skipping block device: %s', p.name)
 
         if p.is_char_device():
-            info(f'Skipping char device: {p.name}')
+            info('Skipping char device: %s', p.name)
 
         if p.is_fifo():
-            info(f'Skipping fifo: {p.name}')
+            info('Skipping fifo: %s', p.name)
 
         if p.is_mount():
-            info(f'Skipping mount: {p.name}')
+            info('Skipping mount: %s', p.name)
 
         if p.is_socket():
-            info(f'Skipping socket: {p.name}')
+            info('Skipping socket: %s', p.name)
         
         if p.is_symlink():
             target = p.readlink()
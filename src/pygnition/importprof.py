@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+
+"""Profile the import of a module that uses pygnition.
+
+```
+python -m pygnition.importprof pygnition.driver
+python -m pygnition.importprof path/to/program.py --json startup.json
+```
+
+The target is imported in a fresh interpreter started with `-X importtime`,
+so everything `pygnition/__init__` does is measured too. That child process
+also counts subprocesses and opened files through audit hooks and times the
+startup helpers `auto_doc`, `auto_class_doc`, `import_chain`, `configure`
+and `parse_arguments`. The parent prints a table sorted by cumulative import
+time and writes everything as JSON.
+
+The target is imported twice, both times with `HOME` and the bytecode cache
+pointed at the same new, empty directory: a cold start, which builds the
+package's caches (docstrings, git index, config snapshot) and may run `git`,
+then a warm start that reuses them. Running `python -m pygnition.importprof`
+imports the package in the parent, which fills the real caches, so the
+children never see those.
+
+Unlike the rest of the package this module doesn't start with
+`from .startmeup import *`, so that importing it by path doesn't run the
+code it measures.
+"""
+
+# Only modules that are already loaded at interpreter startup are imported
+# here, so that the profiling child doesn't import anything the target would
+# otherwise pay for. The rest are imported where they are used.
+import os
+import sys
+import time
+
+PACKAGE = 'pygnition'
+
+# Functions to time, by the module that defines them. Decorator factories
+# are timed when the decorator they return is applied.
+TIMED = {f'{PACKAGE}._imports': ['import_chain'],
+         f'{PACKAGE}._auto_doc': ['auto_doc', 'auto_class_doc'],
+         f'{PACKAGE}.configure': ['configure'],
+         f'{PACKAGE}.arguments': ['parse_arguments'],
+        }
+DECORATOR_FACTORIES = {'auto_doc', 'auto_class_doc'}
+
+SPAWN_EVENTS = {'subprocess.Popen', 'os.system', 'os.posix_spawn', 'os.spawn', 'os.fork', 'os.exec'}
+
+IMPORTTIME_RE = r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$'
+
+# Written to stderr by the child right before it imports the target.
+START_MARKER = 'importprof: importing target'
+
+# --- Child process ----------------------------------------------------------
+
+class _Recorder:
+    def __init__(self):
+        self.spawned = list()
+        self.files = list()
+        self.timings = dict()
+
+    def audit(self, event, args):
+        if event in SPAWN_EVENTS:
+            self.spawned.append([event, repr(args[1] if event == 'subprocess.Popen' else args)[:200]])
+        elif event == 'open':
+            path, mode, flags = args
+            reading = 'r' in mode if mode else not flags & (os.O_WRONLY | os.O_RDWR)
+            if reading and isinstance(path, (str, bytes)):
+                self.files.append(os.fsdecode(path))
+
+    def timed(self, name, func):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                entry = self.timings.setdefault(name, [0, 0.0])
+                entry[0] += 1
+                entry[1] += time.perf_counter() - start
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def timed_factory(self, name, factory):
+        def wrapper(*args, **kwargs):
+            return self.timed(name, factory(*args, **kwargs))
+        wrapper.__wrapped__ = factory
+        return wrapper
+
+class _PatchingFinder:
+    """ Wraps the functions in `TIMED` as soon as their module has executed. """
+
+    def __init__(self, recorder):
+        self.recorder = recorder
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in TIMED:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec:
+                break
+        else:
+            return None
+        exec_module = spec.loader.exec_module
+        recorder = self.recorder
+
+        def exec_and_patch(module):
+            exec_module(module)
+            for name in TIMED[fullname]:
+                wrap = recorder.timed_factory if name in DECORATOR_FACTORIES else recorder.timed
+                setattr(module, name, wrap(name, getattr(module, name)))
+
+        spec.loader.exec_module = exec_and_patch
+        return spec
+
+def profile_child(target: str, out: str):
+    """ Import `target` in this process and write what was recorded to `out`. """
+    recorder = _Recorder()
+    sys.addaudithook(recorder.audit)
+    sys.meta_path.insert(0, _PatchingFinder(recorder))
+    sys.argv = [target]
+    error = None
+    sys.stderr.write(START_MARKER + '\n')
+    sys.stderr.flush()
+    start = time.perf_counter()
+    try:
+        if target.endswith('.py'):
+            import runpy
+            runpy.run_path(target, run_name=os.path.splitext(os.path.basename(target))[0])
+        else:
+            # `-X importtime` only sees imports that go through `__import__`,
+            # not `importlib.import_module`.
+            __import__(target)
+    except BaseException as e:
+        error = f'{type(e).__name__}: {e}'
+    total = time.perf_counter() - start
+
+    import json
+    with open(out, 'w') as f:
+        json.dump({'target': target,
+                   'total': total,
+                   'error': error,
+                   'subprocesses': recorder.spawned,
+                   'files_read': recorder.files,
+                   'functions': {k: {'calls': v[0], 'seconds': v[1]}
+                                 for k, v in recorder.timings.items()},
+                  }, f)
+
+# --- Parent process ---------------------------------------------------------
+
+def parse_importtime(stderr: str) -> tuple[list[dict], str]:
+    """
+    Split the `-X importtime` output for the target's import from the rest
+    of the child's stderr.
+    """
+    import re
+
+    modules = list()
+    other = list()
+    started = False
+    for line in stderr.splitlines():
+        m = re.match(IMPORTTIME_RE, line)
+        if line == START_MARKER:
+            started = True
+        elif m:
+            if not started:
+                continue
+            self_us, cumulative_us, indent, name = m.groups()
+            modules.append({'module': name,
+                            'self': int(self_us) / 1e6,
+                            'cumulative': int(cumulative_us) / 1e6,
+                            'depth': len(indent) // 2})
+        elif not line.startswith('import time: self [us]'):
+            other.append(line)
+    return modules, '\n'.join(other)
+
+def profile_once(target: str, home: str) -> dict:
+    """
+    Import `target` in a fresh interpreter whose home directory and
+    bytecode cache are under `home`, and return the measurements.
+    """
+    import json
+    from pathlib import Path
+    import subprocess
+
+    out = Path(home) / 'profile.json'
+    out.unlink(missing_ok=True)
+    env = dict(os.environ, HOME=home, USERPROFILE=home)
+    env['PYTHONPATH'] = os.pathsep.join([p for p in sys.path if p] + [env.get('PYTHONPATH', '')])
+    start = time.perf_counter()
+    p = subprocess.run([sys.executable, '-X', 'importtime', '-X', f'pycache_prefix={Path(home) / "pycache"}',
+                        __file__, '--child', target, str(out)],
+                       stdin=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, env=env)
+    wall = time.perf_counter() - start
+    if not out.exists():
+        sys.stderr.write(p.stderr)
+        raise RuntimeError(f'Profiling {target} failed with exit code {p.returncode}')
+    result = json.loads(out.read_text())
+    result['modules'], stderr = parse_importtime(p.stderr)
+    if stderr:
+        sys.stderr.write(stderr + '\n')
+    result['process_wall'] = wall
+    return result
+
+def profile(target: str) -> dict:
+    """ `{'cold': ..., 'warm': ...}` measurements of importing `target` (see `profile_once`). """
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as home:
+        return {'cold': profile_once(target, home), 'warm': profile_once(target, home)}
+
+def format_report(result: dict, top: int = 30) -> str:
+    """ The report for both runs of `profile()`. """
+    return '\n\n'.join(format_run(result[run], run, top) for run in ('cold', 'warm'))
+
+def format_run(result: dict, run: str, top: int = 30) -> str:
+    lines = [f"Import profile for {result['target']} ({run} start): {result['total'] * 1000:.1f} ms "
+             f"({result['process_wall'] * 1000:.1f} ms including interpreter startup)"]
+    if result['error']:
+        lines.append(f"Import failed: {result['error']}")
+    lines += ['',
+              f"{'cumulative ms':>14} {'self ms':>10}  module",
+              f"{'-' * 14} {'-' * 10}  {'-' * 40}"]
+    for m in sorted(result['modules'], key=lambda m: m['cumulative'], reverse=True)[:top]:
+        lines.append(f"{m['cumulative'] * 1000:14.2f} {m['self'] * 1000:10.2f}  {m['module']}")
+    lines += ['',
+              f"{'total ms':>14} {'calls':>10}  function",
+              f"{'-' * 14} {'-' * 10}  {'-' * 40}"]
+    for name, f in sorted(result['functions'].items(), key=lambda i: i[1]['seconds'], reverse=True):
+        lines.append(f"{f['seconds'] * 1000:14.2f} {f['calls']:10d}  {name}")
+    lines += ['',
+              f"Subprocesses spawned: {len(result['subprocesses'])}"]
+    lines += [f'    {event} {args}' for event, args in result['subprocesses']]
+    lines.append(f"Files read: {len(result['files_read'])} ({len(set(result['files_read']))} distinct)")
+    return '\n'.join(lines)
+
+def main(argv: list[str] | None = None):
+    from argparse import ArgumentParser
+    import json
+    from pathlib import Path
+
+    ap = ArgumentParser(prog=f'python -m {PACKAGE}.importprof',
+                        description='Measure what importing a module costs at startup.')
+    ap.add_argument('target', help='Module name or path to a .py file to import.')
+    ap.add_argument('-j', '--json', help='Where to write the JSON dump (default: importprof-<target>.json).')
+    ap.add_argument('-n', '--top', type=int, default=30, help='Number of modules to list.')
+    args = ap.parse_args(argv)
+
+    result = profile(args.target)
+    print(format_report(result, args.top))
+    json_file = Path(args.json or f'importprof-{Path(args.target).stem}.json')
+    json_file.write_text(json.dumps(result, indent=2))
+    print(f'JSON written to {json_file}')
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--child']:
+        # Running as a script puts this directory first on `sys.path`, where
+        # modules like `files` and `constants` would shadow real ones.
+        if sys.path and os.path.realpath(sys.path[0]) == os.path.dirname(os.path.realpath(__file__)):
+            sys.path.pop(0)
+        profile_child(sys.argv[2], sys.argv[3])
+    else:
+        main()
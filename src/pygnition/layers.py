@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+from pathlib import Path
+
+from .startmeup import *
+
+MODULE_NAME = Path(__file__).stem
+
+__doc__ = f"""Python IDE for the command line.
+
+========== ⚠️  WARNING! ⚠️  ==========
+This project is currently under construction.
+Stay tuned for updates.
+
+Module: {PACKAGE_NAME}.{MODULE_NAME}
+Version: {VERSION}
+Author: {AUTHOR}
+Date: {LAST_SAVED_DATE}
+
+## Description
+
+This module defines the Layers mapping, which looks settings up across
+named layers (command line, environment, user configuration, application
+defaults) without merging them, and remembers which layer each value came
+from. LayeredNamespace exposes a `Layers` object as attributes.
+
+## Typical Use
+```python
+layers = Layers(('cli', vars(args)), ('env', Environment()), ('user cfg', config))
+layers['port'], layers.source('port')
+
+## Notes
+
+Resolved keys are cached. Call `invalidate()` after changing a layer in
+place, or `replace()` to swap a layer for a new mapping.
+
+## [GitHub]({get_upstream_url()})
+
+"""
+
+from collections.abc import Iterable, Mapping
+from pprint import pformat
+import threading
+from types import SimpleNamespace
+
+class Layers(Mapping):
+    @auto_doc(AUTO_DOC_HEAD)
+    def __init__(self, *layers: tuple[str, Mapping]):  # `(name, mapping)` pairs, highest priority first.
+        self.names = [name for name, _ in layers]
+        self.maps = [mapping for _, mapping in layers]
+        self._resolved = dict()
+        # Bumped by every invalidation, so a lookup that raced with one isn't cached.
+        self._generation = 0
+        self._lock = threading.RLock()
+
+    def resolve(self, key: str) -> tuple[object, str]:
+        """ Return `(value, layer name)` for `key` from the first layer that has it. """
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+        generation = self._generation
+        for name, mapping in zip(self.names, self.maps):
+            if key in mapping:
+                result = (mapping[key], name)
+                with self._lock:
+                    if self._generation == generation:
+                        self._resolved[key] = result
+                return result
+        raise KeyError(key)
+
+    def __getitem__(self, key: str):
+        return self.resolve(key)[0]
+
+    def __iter__(self):
+        return iter(dict.fromkeys(k for mapping in self.maps for k in mapping))
+
+    def __len__(self) -> int:
+        return len(set().union(*self.maps))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(map(repr, zip(self.names, self.maps)))})"
+
+    def source(self, key: str) -> str | None:
+        """ The name of the layer `key` is resolved from, or None. """
+        try:
+            return self.resolve(key)[1]
+        except KeyError:
+            return None
+
+    def provenance(self) -> dict[str, tuple[object, str]]:
+        """ `{key: (value, layer name)}` for every key. """
+        return {k: self.resolve(k) for k in self}
+
+    def invalidate(self, keys: Iterable[str] | None = None):
+        """ Forget resolved `keys` (all of them by default) after a layer changed in place. """
+        with self._lock:
+            self._generation += 1
+            if keys is None:
+                self._resolved = dict()
+            else:
+                for k in keys:
+                    self._resolved.pop(k, None)
+
+    def replace(self, name: str, mapping: Mapping) -> dict[str, tuple[object, object]]:
+        """
+        Swap the layer called `name` for `mapping` and return
+        `{key: (old value, new value)}` for the keys whose resolved value changed.
+        """
+        with self._lock:
+            i = self.names.index(name)
+            keys = set(self.maps[i]) | set(mapping)
+            old = {k: self.get(k) for k in keys}
+            self.maps[i] = mapping
+            self.invalidate(keys)
+            return {k: (old[k], self.get(k)) for k in keys if old[k] != self.get(k)}
+
+    def with_layers(self, top: Iterable[tuple[str, Mapping]] = (),
+                    bottom: Iterable[tuple[str, Mapping]] = ()) -> 'Layers':
+        """ A new `Layers` with extra layers above and below these, sharing the mappings. """
+        return Layers(*top, *zip(self.names, self.maps), *bottom)
+
+    def dumps(self) -> str:
+        return pformat({k: f'{v!r}  [{name}]' for k, (v, name) in sorted(self.provenance().items())})
+
+class LayeredNamespace(SimpleNamespace):
+    """
+    A namespace whose missing attributes are looked up in `Layers`.
+    Attributes set on the object itself take precedence over every layer.
+    """
+    def __init__(self, layers: Layers | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self._layers = layers if layers is not None else Layers()
+
+    def __getattr__(self, name: str):
+        if not name.startswith('_'):
+            try:
+                return self._layers[name]
+            except KeyError:
+                pass
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._layers))
@@ -35,10 +35,23 @@ details here.
 """
 
 
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 from datetime import datetime
+import gzip
+import json
+import logging
+from logging.handlers import BaseRotatingHandler, QueueHandler, QueueListener
+import os
+import queue
+import re
+import shutil
 import sys
+import threading
+import time
 
-from .interpreters import RUNNING_CLI, RUNNING_IN_JUPYTER
+from .interpreters import PROGRAM_PATH, RUNNING_CLI, RUNNING_IN_JUPYTER
 from .picts import CRITICAL_PICT, current_clock_pict, DEBUG_PICT, ERROR_PICT, GEAR_PICT, INFO_PICT, LOG_PICT, WARNING_PICT
 from .tools import *
 from .where import USER_DATA_DIR, VERBOSE
@@ -50,13 +63,377 @@ LOG_PICTS = { logging.DEBUG: DEBUG_PICT,
               logging.CRITICAL: CRITICAL_PICT
             }
 
+# Set by `Driver` while a command runs, for the `command` field of JSON records.
+COMMAND_NAME = ContextVar('command_name', default=None)
+PROGRAM = PROGRAM_PATH.stem if PROGRAM_PATH else Path(sys.argv[0]).stem or PACKAGE_NAME
+LOG_FORMATS = ('text', 'json')
+JSON_BUFFER_SIZE = 1 << 16
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per record: timestamp, level, module, program, command,
+    message (without its picture) and the fields passed to `log()`.
+    """
+    def format(self, record) -> str:
+        d = {'timestamp': datetime.fromtimestamp(record.created).astimezone().isoformat(timespec='milliseconds'),
+             'level': record.levelname,
+             'module': record.module,
+             'program': PROGRAM,
+             'command': getattr(record, 'command_name', None) or COMMAND_NAME.get(),
+             'message': getattr(record, 'text', None) or record.getMessage()}
+        d.update(getattr(record, 'fields', None) or ())
+        if record.exc_info:
+            d['exception'] = self.formatException(record.exc_info)
+        elif getattr(record, 'exception', None):
+            d['exception'] = record.exception
+        return json.dumps(d, default=str)
+
+def _not_spacer(record) -> bool:
+    return not getattr(record, 'spacer', False)
+
+class BatchFlushMixin:
+    """ Leaves flushing to `flush_batch()`, so a batch of records costs one flush. """
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+    def close(self):
+        self.flush_batch()
+        super().close()
+
+SIZE_UNITS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+INTERVALS = {'hourly': 3600, 'daily': 86400, 'weekly': 7 * 86400}
+INTERVAL_UNITS = {'': 1, 's': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400}
+
+@auto_doc("Parse a size such as `10M` or `512K` into bytes.")
+def parse_size(s: str) -> int:
+    m = re.fullmatch(r'\s*(\d+)\s*([KMG]?)B?\s*', s, re.IGNORECASE)
+    if not m:
+        raise ValueError(f'not a size: {s!r}')
+    return int(m.group(1)) * SIZE_UNITS[m.group(2).upper()]
+
+@auto_doc("Parse an interval such as `daily`, `12h` or `3600` into seconds.")
+def parse_interval(s: str) -> int:
+    if s.strip().lower() in INTERVALS:
+        return INTERVALS[s.strip().lower()]
+    m = re.fullmatch(r'\s*(\d+)\s*([smhdw]?)\s*', s, re.IGNORECASE)
+    if not m:
+        raise ValueError(f'not an interval: {s!r}')
+    return int(m.group(1)) * INTERVAL_UNITS[m.group(2).lower()]
+
+# One thread compresses and prunes rotated logs, so logging never waits for
+# gzip. Its thread is joined at exit, so no segment is left half written;
+# rollovers after that are compressed in place.
+_compressor = None
+
+# Segments renamed but not compressed yet, which pruning leaves alone.
+_uncompressed = set()
+_uncompressed_lock = threading.Lock()
+
+def segment_sequence(base: str, name: str) -> int | None:
+    """ The rotation number of the segment file `name` of log `base`, or None if it isn't one. """
+    m = re.fullmatch(re.escape(os.path.basename(base)) + r'\.(\d+)-\d{8}-\d{6}(?:\.gz)?', name)
+    return int(m.group(1)) if m else None
+
+def _segments(base: str) -> list[tuple[int, str]]:
+    """ `(sequence, path)` for every rotated segment of `base`, newest first. """
+    directory = os.path.dirname(base) or '.'
+    found = ((segment_sequence(base, e.name), e.path) for e in os.scandir(directory) if e.is_file())
+    return sorted(((n, path) for n, path in found if n is not None), reverse=True)
+
+def _compress(segment: str):
+    with open(segment, 'rb') as src, gzip.open(segment + '.gz', 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(segment)
+
+def _compress_and_prune(segment: str | None, base: str, backups: int):
+    """
+    Compress `segment`, then delete all but the newest `backups` segments
+    by rotation number, except those still waiting to be compressed.
+    """
+    try:
+        if segment:
+            _compress(segment)
+    finally:
+        with _uncompressed_lock:
+            _uncompressed.discard(segment)
+            waiting = set(_uncompressed)
+        for _, path in _segments(base)[backups:]:
+            if path not in waiting:
+                os.remove(path)
+
+def _compress_job(*args):
+    """ `_compress_and_prune` on the compressor thread, which can log its failures. """
+    try:
+        _compress_and_prune(*args)
+    except OSError as e:
+        warn('Compressing or pruning rotated logs failed: %s', e)
+
+class JsonLinesMixin:
+    """ Writes records with `JsonFormatter`, leaving out the blank spacer lines. """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.setFormatter(JsonFormatter())
+        self.addFilter(_not_spacer)
+
+class BufferedBatchMixin(BatchFlushMixin):
+    """
+    Writes through a `JSON_BUFFER_SIZE` buffer, so many records go out in
+    one write. The buffer is flushed when it fills, by `flush_batch()`, on
+    close and after every error. Only for handlers behind a
+    `BatchQueueListener`, which calls `flush_batch()` whenever the queue
+    runs dry; otherwise a quiet program could hold records back for good.
+    """
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=JSON_BUFFER_SIZE,
+                    encoding=self.encoding or 'utf-8', errors=self.errors)
+
+    def emit(self, record):
+        super().emit(record)
+        if record.levelno >= logging.ERROR:
+            self.flush_batch()
+
+class RotatingLogHandler(BaseRotatingHandler):
+    """
+    Starts a new log file when the current one would grow past `max_bytes`
+    or is older than `rotate_every` seconds (either can be 0 for never).
+    The old file is renamed `<file>.<rotation number>-<timestamp>`, gzipped
+    in the background if `compress` is set, and only the newest `backups`
+    (by rotation number) are kept.
+    """
+    def __init__(self, filename, max_bytes: int = 0, rotate_every: int = 0,
+                 backups: int = 5, compress: bool = True, encoding=None):
+        super().__init__(filename, 'a', encoding=encoding)
+        self.max_bytes = max_bytes
+        self.rotate_every = rotate_every
+        self.backups = backups
+        self.compress = compress
+        self.rollover_at = time.time() + rotate_every if rotate_every else None
+        # Counted here rather than asked of the stream, since `tell()` flushes a buffered one.
+        self.size = os.path.getsize(self.baseFilename) if os.path.exists(self.baseFilename) else 0
+        segments = _segments(self.baseFilename)
+        self.sequence = segments[0][0] if segments else 0
+
+    def emit(self, record):
+        """ Format `record` once, roll over if its encoded size won't fit, then write it. """
+        try:
+            line = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            size = len(line.encode(self.stream.encoding, 'replace')) if self.max_bytes else 0
+            if (self.rollover_at and time.time() >= self.rollover_at
+                    or self.max_bytes and self.size and self.size + size > self.max_bytes):
+                self.doRollover()
+                self.size = 0
+            self.stream.write(line)
+            self.size += size
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def doRollover(self):
+        global _compressor
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        segment = None
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename):
+            self.sequence += 1
+            segment = f"{self.baseFilename}.{self.sequence:06d}-{time.strftime('%Y%m%d-%H%M%S')}"
+            os.rename(self.baseFilename, segment)
+        self.stream = self._open()
+        if self.rotate_every:
+            self.rollover_at = time.time() + self.rotate_every
+        if segment and self.compress:
+            with _uncompressed_lock:
+                _uncompressed.add(segment)
+        args = (segment if self.compress else None, self.baseFilename, self.backups)
+        if _compressor is None:
+            _compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='log-compress')
+        try:
+            _compressor.submit(_compress_job, *args)
+        except RuntimeError:  # the interpreter is shutting down (a queued flush at exit)
+            try:
+                _compress_and_prune(*args)
+            except OSError as e:  # logging from inside the handler could recurse into it
+                print(f'{WARNING_PICT}Compressing or pruning rotated logs failed: {e}', file=sys.stderr)
+
+class BatchStreamHandler(BatchFlushMixin, logging.StreamHandler):
+    pass
+
+class BatchFileHandler(BatchFlushMixin, logging.FileHandler):
+    pass
+
+class BatchRotatingLogHandler(BatchFlushMixin, RotatingLogHandler):
+    pass
+
+class JsonFileHandler(JsonLinesMixin, logging.FileHandler):
+    pass
+
+class JsonRotatingLogHandler(JsonLinesMixin, RotatingLogHandler):
+    pass
+
+class BatchJsonFileHandler(BufferedBatchMixin, JsonFileHandler):
+    pass
+
+class BatchJsonRotatingLogHandler(BufferedBatchMixin, JsonRotatingLogHandler):
+    pass
+
+class ContextQueueHandler(QueueHandler):
+    """
+    Queues records with what the listener thread can't find out later: the
+    running command, and the message and traceback before `prepare()` merges
+    them into one string.
+    """
+    def prepare(self, record):
+        record.command_name = COMMAND_NAME.get()
+        if not getattr(record, 'text', None):
+            record.text = record.getMessage()
+        if record.exc_info:
+            record.exception = logging.Formatter().formatException(record.exc_info)
+        return super().prepare(record)
+
+class BatchQueueListener(QueueListener):
+    """
+    Hands queued records to its handlers on a background thread and flushes
+    them whenever the queue runs dry.
+    """
+    def dequeue(self, block):
+        if self.queue.empty():
+            self.flush()
+        return super().dequeue(block)
+
+    def flush(self):
+        for handler in self.handlers:
+            getattr(handler, 'flush_batch', handler.flush)()
+
+    def stop(self):
+        super().stop()
+        self.flush()
+
+class RateLimiter:
+    """
+    Lets through at most `limit` messages per `interval` seconds for each
+    key (a level and a message template) and counts the rest. When a key's
+    interval is over, or at `flush()`, one summary of what was suppressed
+    is passed to `report(level, count, template)`.
+    """
+    def __init__(self, limit: int, interval: float, report):
+        self.limit = limit
+        self.interval = interval
+        self.report = report
+        self._windows = dict()  # key: [window start, messages seen]
+        self._next_sweep = time.monotonic() + interval
+        self._lock = threading.Lock()
+
+    def allow(self, level, template) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            expired = self._sweep(now) if now >= self._next_sweep else ()
+            window = self._windows.get((level, template))
+            if window is None or now - window[0] >= self.interval:
+                if window:
+                    expired = (*expired, ((level, template), window[1] - self.limit))
+                window = self._windows[(level, template)] = [now, 0]
+            window[1] += 1
+            allowed = window[1] <= self.limit
+        self._report(expired)
+        return allowed
+
+    def _sweep(self, now) -> list:
+        self._next_sweep = now + self.interval
+        expired = [(key, window[1] - self.limit) for key, window in self._windows.items()
+                   if now - window[0] >= self.interval]
+        for key, _ in expired:
+            del self._windows[key]
+        return expired
+
+    def flush(self):
+        """ Report everything suppressed so far and start over. """
+        with self._lock:
+            expired = [(key, window[1] - self.limit) for key, window in self._windows.items()]
+            self._windows = dict()
+        self._report(expired)
+
+    def _report(self, expired):
+        for (level, template), count in expired:
+            if count > 0:
+                self.report(level, count, template)
+
+def _template_text(template) -> str:
+    if isinstance(template, str):
+        return template
+    return f'{template.co_name} ({Path(template.co_filename).name}:{template.co_firstlineno})'
+
+def _report_suppressed(level, count, template):
+    message = f'Suppressed {count} similar message{"s" if count > 1 else ""}: {_template_text(template)}'
+    ROOT_LOGGER.log(level, f'{LOG_PICTS[level]}{message}', extra={'text': message, 'fields': {'suppressed': count}})
+
+_limiter = None
+
+@auto_doc("Limit every message template to `limit` per `interval` seconds (0 turns it off).")
+def limit_rate(limit: int, interval: float = 60):
+    """
+    Messages are grouped by level and template: the format string before
+    `%` arguments are filled in, or the code of a message function. So
+    `warn('File %s does not exist!', p)` is limited as one message for
+    every `p`, while an f-string message only matches itself. Errors and
+    critical messages, and messages that aren't strings or functions, are
+    never limited.
+    """
+    global _limiter
+    if _limiter:
+        _limiter.flush()
+    _limiter = RateLimiter(limit, interval, _report_suppressed) if limit else None
+
+def _flush_rate_limiter():
+    if _limiter:
+        _limiter.flush()
+
+_listener = None
+
+@auto_doc("Stop the queued logging thread after it has written every record.")
+def stop_queued_logging():
+    global _listener
+    _flush_rate_limiter()
+    if _listener:
+        _listener.stop()
+        _listener = None
+
+atexit.register(stop_queued_logging)
+
 @auto_doc("Set up the logging module and file.")
-def setuplog(LOGFILE:Path|str, level):
+def setuplog(LOGFILE:Path|str, level, queued:bool=False,
+             max_bytes:int=0, rotate_every:int=0, backups:int=5, compress:bool=True,
+             file_format:str='text', rate_limit:int=0, rate_interval:float=60):
+    """
+    With `queued`, log calls only put the record on a queue; a
+    `BatchQueueListener` thread owns the console and file handlers, writes
+    the records in batches and is flushed and stopped at exit.
+
+    With `max_bytes` or `rotate_every` (seconds), the log file is appended
+    to and rotated by a `RotatingLogHandler` instead of being emptied at
+    every start.
+
+    With `file_format='json'`, the log file gets one JSON object per record
+    (see `JsonFormatter`) while the console keeps the readable format.
+
+    With `rate_limit`, each message template is logged at most that many
+    times per `rate_interval` seconds (see `limit_rate`).
+    """
     if type(LOGFILE) is str:
         LOGFILE = Path(LOGFILE)
+    rotating = bool(max_bytes or rotate_every)
+    if file_format not in LOG_FORMATS:
+        raise ValueError(f'file_format must be one of {LOG_FORMATS}, not {file_format!r}')
         
     if LOGFILE.exists():
-        LOGFILE.write_text('')
+        if not rotating:
+            LOGFILE.write_text('')
     else:
         LOGFILE.parent.mkdir(parents=True, exist_ok=True)
         
@@ -68,16 +445,40 @@ def setuplog(LOGFILE:Path|str, level):
     formatter = logging.Formatter('%(message)s')
     # formatter = logging.Formatter(f'{LOG_PICTS
 
+    handlers = list()
     if not RUNNING_IN_JUPYTER:
         # Console handler
-        console_handler = logging.StreamHandler(sys.stderr)
+        console_handler = (BatchStreamHandler if queued else logging.StreamHandler)(sys.stderr)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
     # File handler
-    file_handler = logging.FileHandler(LOGFILE)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    if file_format == 'json' and rotating:
+        file_handler = (BatchJsonRotatingLogHandler if queued else JsonRotatingLogHandler)(
+            LOGFILE, max_bytes, rotate_every, backups, compress)
+    elif file_format == 'json':
+        file_handler = (BatchJsonFileHandler if queued else JsonFileHandler)(LOGFILE)
+    elif rotating:
+        file_handler = (BatchRotatingLogHandler if queued else RotatingLogHandler)(
+            LOGFILE, max_bytes, rotate_every, backups, compress)
+    else:
+        file_handler = (BatchFileHandler if queued else logging.FileHandler)(LOGFILE)
+    if file_format == 'text':
+        file_handler.setFormatter(formatter)
+    handlers.append(file_handler)
+
+    if queued:
+        global _listener
+        stop_queued_logging()
+        records = queue.SimpleQueue()
+        logger.addHandler(ContextQueueHandler(records))
+        _listener = BatchQueueListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
+
+    limit_rate(rate_limit, rate_interval)
 
     logger.debug(f"{GEAR_PICT}Logging configuration complete.")
     logger.debug(f'{LOG_PICT}Log file: {LOGFILE.resolve()}')
@@ -86,27 +487,54 @@ def setuplog(LOGFILE:Path|str, level):
 
     return logger
 
-def log(level, message):
+ROOT_LOGGER = logging.getLogger()
+
+def enabled(level) -> bool:
+    """ True if a message at `level` would be logged (cached per level by `logging`). """
+    return ROOT_LOGGER.isEnabledFor(level)
+
+def _log(level, message, args, fields):
+    if not ROOT_LOGGER.isEnabledFor(level):
+        return
+    if _limiter and level < logging.ERROR and (isinstance(message, str) or callable(message)):
+        if not _limiter.allow(level, getattr(message, '__code__', message)):
+            return
+    if callable(message):
+        message = message()
+    elif args:
+        message = message % args
     if NEWLINE in message:
-        logging.log(level, '')
-    logging.log(level, f"{LOG_PICTS[level]}{message}")
+        ROOT_LOGGER.log(level, '', extra={'spacer': True})
+    # stacklevel 3 skips this function and its caller, so records get the module that logged.
+    ROOT_LOGGER.log(level, f"{LOG_PICTS[level]}{message}", stacklevel=3,
+                    extra={'text': message, 'fields': fields})
+
+def log(level, message, *args, **fields):
+    """
+    Log `message` with its picture. Nothing is formatted unless `level` is
+    enabled: `message` can be a `%`-style format string for `args`, or a
+    function with no arguments that returns the message, so
+    `debug(lambda: pformat(big))` costs next to nothing when debugging is off.
+    Keyword arguments are extra fields for the JSON log format.
+    """
+    _log(level, message, args, fields)
     # if NEWLINE in message:
     #     logging.log(level, '')
 
-def debug(message):
-    log(logging.DEBUG, message)
+def debug(message, *args, **fields):
+    _log(logging.DEBUG, message, args, fields)
 
-def info(message):
-    log(logging.INFO, message)
+def info(message, *args, **fields):
+    _log(logging.INFO, message, args, fields)
 
-def warn(message):
-    log(logging.WARNING, message)
+def warn(message, *args, **fields):
+    _log(logging.WARNING, message, args, fields)
 
-def error(message):
-    log(logging.ERROR, message)
+def error(message, *args, **fields):
+    _log(logging.ERROR, message, args, fields)
 
-def stop(message):
-    log(logging.CRITICAL, message)
+def stop(message, *args, **fields):
+    _log(logging.CRITICAL, message, args, fields)
     if RUNNING_CLI:
         exit(1)
 
@@ -46,7 +46,7 @@ def display_doc(func):
     Display a function or class docstring as Markdown in Jupyter Lab
     safely, avoiding duplicated headers.
     """
-    doc = func.__doc__ or ""
+    doc = render_doc(func) or ""
     # Split lines and remove any that are blank at the start
     lines = doc.splitlines()
     while lines and not lines[0].strip():
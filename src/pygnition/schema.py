@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+from pathlib import Path
+
+from .startmeup import *
+
+MODULE_NAME = Path(__file__).stem
+
+__doc__ = f"""Python IDE for the command line.
+
+========== ⚠️  WARNING! ⚠️  ==========
+This project is currently under construction.
+Stay tuned for updates.
+
+Module: {PACKAGE_NAME}.{MODULE_NAME}
+Version: {VERSION}
+Author: {AUTHOR}
+Date: {LAST_SAVED_DATE}
+
+## Description
+
+This module defines the Setting class, used to declare the type, default
+and allowed values of a program's settings, and `compile_schema`, which
+turns such a declaration into one function that converts and checks all of
+them at once.
+
+## Typical Use
+```python
+class Server(Program):
+    schema = {{'host': Setting(str, '127.0.0.1'), 'port': Setting(int, 8888)}}
+
+## Notes
+
+Values that aren't strings (command line options, defaults) are taken as
+they are. Every bad value is reported in a single `SettingsError`.
+
+## [GitHub]({get_upstream_url()})
+
+"""
+
+from collections.abc import Callable, Mapping
+from typing import Any, NamedTuple
+
+TRUE_STRINGS = {'1', 'true', 'yes', 'on'}
+FALSE_STRINGS = {'0', 'false', 'no', 'off', ''}
+
+class SettingsError(ValueError):
+    pass
+
+REQUIRED = object()
+
+def to_bool(s: str) -> bool:
+    if s.strip().lower() in TRUE_STRINGS:
+        return True
+    if s.strip().lower() in FALSE_STRINGS:
+        return False
+    raise ValueError(f'not a boolean: {s!r}')
+
+def to_list(s: str) -> list[str]:
+    """ Split on ';' or ',' (whichever appears), dropping empty items. """
+    sep = ';' if ';' in s else ','
+    return [item.strip() for item in s.split(sep) if item.strip()]
+
+# Converters for types whose constructor doesn't parse strings the way
+# config files write them.
+CONVERTERS = {bool: to_bool, list: to_list}
+
+class Setting(NamedTuple):
+    type: Callable[[str], Any] = str
+    default: Any = REQUIRED
+    choices: tuple | None = None
+
+def compile_schema(schema: Mapping[str, Setting]) -> Callable[[Mapping], dict]:
+    """
+    Return a function that takes the raw settings (any mapping) and returns
+    `{key: typed value}` for every key in `schema`, or raises
+    `SettingsError` listing every missing or invalid value.
+    """
+    plan = tuple((key, CONVERTERS.get(s.type, s.type), s.default,
+                  frozenset(s.choices) if s.choices is not None else None)
+                 for key, s in schema.items())
+
+    def coerce(raw: Mapping) -> dict:
+        typed = dict()
+        errors = list()
+        for key, convert, default, choices in plan:
+            value = raw.get(key, default)
+            if value is REQUIRED:
+                errors.append(f'{key} is required')
+                continue
+            if isinstance(value, str) and convert is not str:
+                try:
+                    value = convert(value)
+                except (TypeError, ValueError) as e:
+                    errors.append(f'{key}: {e}')
+                    continue
+            if choices is not None and value not in choices:
+                errors.append(f'{key}: {value!r} is not one of {sorted(map(str, choices))}')
+                continue
+            typed[key] = value
+        if errors:
+            raise SettingsError('Invalid settings:\n    ' + '\n    '.join(errors))
+        return typed
+
+    return coerce
@@ -56,7 +56,8 @@ from .interpreters import PROGRAM_PATH
 from .lumberjack import debug, error, info, stop, warn
 from pygnition.picts import *
 from .program import Program
-from .settings import CONFIG_FILES, Settings
+from .schema import Setting
+from .settings import Settings
 
 class MyTCPServer(socketserver.TCPServer):
     def __init__(self, server_address, RequestHandlerClass):
@@ -66,6 +67,9 @@ class MyTCPServer(socketserver.TCPServer):
         self.allow_reuse_address = True
 
 class Server(Program):
+    schema = {'host': Setting(str, '127.0.0.1'),
+              'port': Setting(int, 8888)}
+
     def __init__(self):
         super().__init__()
         atexit.register(self.shutdown)
@@ -97,14 +101,14 @@ class Server(Program):
         self.httpd = None
         self.thread = None
 
-        self.port = int(self.port)
+        self.on_any_change(('host', 'port'), self.restart)
 
-        debug(f'''Initialized {PROGRAM_NAME}:
+        debug(lambda: f'''Initialized {PROGRAM_NAME}:
 
 Server object dir: {pformat([s for s in dir(self) if not s.startswith('_')])}''')
-        debug(f'''Configuration:
+        debug(lambda: f'''Configuration:
 
-Configuration files: {str(CONFIG_FILES)}
+Configuration files: {str(self.config_files)}
 Host: {self.host}
 Port: {self.port}
 `hwww` data directory: {USER_DATA_DIR}
@@ -117,8 +121,18 @@ ConfigParser: {self.config}
 
     def run(self):
         debug(f'Running {PROGRAM_NAME}')
+        self.watch()
         self.start()
 
+    def restart(self, changes: dict):
+        """ Serve on the new host or port after the configuration changes. """
+        info('; '.join(f'{key} changed from {old} to {new}' for key, (old, new) in sorted(changes.items()))
+             + '; restarting the server.')
+        if self.thread and self.thread.is_alive():
+            self.stop()
+            self.thread.join()
+            self.start()
+
     def shutdown(self):
         print(f"{CHECK_PICT}Execution complete.")
         print(f'{WAVE_PICT}Goodbye!')
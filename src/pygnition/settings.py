@@ -35,114 +35,313 @@ details here.
 
 """
 
+from collections.abc import Iterable, Iterator
 import logging
+import mmap
 import os
 from pathlib import Path
 from pprint import pformat
 import shutil
+import threading
 from types import SimpleNamespace
+from typing import Callable
 
 from pygnition.arguments import parse_arguments
-from pygnition.configure import configure
+from pygnition.configure import config_snapshot
 # from pygnition.constants import DESCRIPTION, EPILOG, VERSION
 from pygnition.environment import Environment
 from .interpreters import RUNNING_CLI, RUNNING_GATEWAY
-from pygnition.lumberjack import debug, error, info, setuplog, stop, warn
-from pygnition.stdinput import get_piped_input
+from .layers import LayeredNamespace, Layers
+from .schema import compile_schema, Setting
+from pygnition.lumberjack import debug, error, info, LOG_FORMATS, parse_interval, parse_size, setuplog, stop, warn
+from pygnition.stdinput import CHUNK_SIZE, get_piped_input, iter_chunks, iter_lines, map_stdin
 from pygnition.tools import mkdir
+from .watcher import ConfigWatcher
 from .where import DEBUG, PROJ_DATA, TESTING, USER_DATA_DIR, USER_PREFS_DIR, VERBOSE
 
-# breakpoint()
-INPUT = get_piped_input()
-
 # PROJECT_DIR = Path(__file__).resolve().parent.parent if RUNNING_CLI else Path(os.curdir).resolve()
 ARGS_FILE = PROJ_DATA / 'std_opts.csv'
-# CONFIG_FILE = USER_DATA_DIR / f'etc/{PROGRAM_NAME}.cfg'
-# if not CONFIG_FILE.exists():
-
-# CONFIG_FILE = PROJECT_DIR / 'etc/config.ini'
-# LOG_FILE = PROJECT_DIR / f'logs/{PROGRAM_NAME}.log'
 APP_DEFAULT_PREFS_DIR = PACKAGE_PATH / 'etc'
 if not APP_DEFAULT_PREFS_DIR.exists():
     APP_DEFAULT_PREFS_DIR = PACKAGE_PATH.parent / 'etc'
-    
-if not USER_PREFS_DIR.exists():
-    shutil.copytree(APP_DEFAULT_PREFS_DIR, USER_PREFS_DIR)
-CONFIG_FILES = [USER_PREFS_DIR / s for s in os.listdir(USER_PREFS_DIR) if Path(s).suffix in {'.ini', '.cfg'}]
-
-LOG_FILE = USER_DATA_DIR / f'logs/{PACKAGE_NAME}.log'
-
-# assert(PROJECT_DIR.exists())
-# assert(ARGS_FILE.exists())
-# assert(CONFIG_FILE.exists())
-
-ARGS = None
-if RUNNING_CLI:
-    # print(f'Arguments file: {ARGS_FILE}')
-    if ARGS_FILE.exists():
-        ARGS = parse_arguments(ARGS_FILE, PACKAGE_NAME, VERSION, DESCRIPTION,
-                               (PROJ_DATA / 'epilog.txt').read_text().strip())
-
-# print(str(ARGS_FILE))
-
-# assert(ARGS)
-
-if ARGS:
-    if hasattr(ARGS, 'config'):
-        if ARGS.config:
-            CONFIG_FILES = [ARGS.config]
-
-ENV = Environment()
 
-# print('Configuration file: ' + str(CONFIG_FILE))
-CONFIG = None
-if CONFIG_FILES:
-    CONFIG = configure(CONFIG_FILES).config
-#else:
-#    if not USER_PREFS_DIR.exists():
-#        shutil.copytree(PROJECT_DIR / 'etc', USER_PREFS_DIR)
-#
-if ARGS:
-    if hasattr(ARGS, 'log'):
-        if ARGS.log:
-            LOG_FILE = ARGS.log
-elif CONFIG and ('LOG_FILE' in CONFIG['DEFAULT'].keys()):
-    LOG_FILE = CONFIG['DEFAULT']['LOG_FILE']
-# LOG_FILE = ARGS.LOG_FILE if ARGS.LOG_FILE else CONFIG['DEFAULT']['LOG_FILE']
+# Importing this module has no side effects. The settings are loaded in
+# these phases, in this order, the first time a `Settings` object (or a
+# `Program`) is created, or when `Settings.load()` is called.
+PHASES = ('stdin', 'prefs', 'args', 'config', 'env', 'logging')
+
+# The 'stdin' phase reads all of stdin into the `input` setting. Programs
+# that process their input as it arrives leave it out and use
+# `input_lines()`, `input_chunks()` or `input_map()` instead.
+STREAMING_PHASES = tuple(p for p in PHASES if p != 'stdin')
+
+# Phases that have to run before another one can: `--config`, `--log` and
+# `--debug` come from the command line, and logging reads the config.
+PHASE_REQUIRES = {'config': ('prefs', 'args'), 'logging': ('args', 'config')}
+
+# The old module-level names, still available through `__getattr__`, and
+# the phase that sets each of them.
+LOADED_NAMES = {'INPUT': 'stdin', 'CONFIG_FILES': 'config', 'ARGS': 'args', 'CONFIG': 'config',
+                'ENV': 'env', 'LOG_FILE': 'logging', 'LOG_LEVEL': 'logging', 'SETTINGS': None}
+
+# Settings layers, highest priority first.
+LAYERS = ('input', 'cli', 'env', 'user cfg', 'app defaults', 'cli defaults')
+
+_loaded = SimpleNamespace(phases=list(), INPUT=None, CONFIG_FILES=list(), ARGS=None, CONFIG=None,
+                          DEFAULTS=dict(), ENV=None, LOG_FILE=USER_DATA_DIR / f'logs/{PACKAGE_NAME}.log',
+                          LOG_LEVEL=logging.WARNING, SETTINGS=Layers())
+
+def _read_stdin(s: SimpleNamespace):
+    s.INPUT = get_piped_input()
+
+def _read_prefs(s: SimpleNamespace):
+    if not USER_PREFS_DIR.exists():
+        shutil.copytree(APP_DEFAULT_PREFS_DIR, USER_PREFS_DIR)
+    s.CONFIG_FILES = [USER_PREFS_DIR / f for f in os.listdir(USER_PREFS_DIR) if Path(f).suffix in {'.ini', '.cfg'}]
+
+def _parse_args(s: SimpleNamespace):
+    if RUNNING_CLI and ARGS_FILE.exists():
+        s.ARGS = parse_arguments(ARGS_FILE, PACKAGE_NAME, VERSION, DESCRIPTION,
+                                 (PROJ_DATA / 'epilog.txt').read_text().strip())
+
+def _read_config(s: SimpleNamespace):
+    if s.ARGS and getattr(s.ARGS, 'config', None):
+        s.CONFIG_FILES = [s.ARGS.config]
+    if s.CONFIG_FILES:
+        # `{section: {key: value}}` with lowercase keys, served from a snapshot on warm starts.
+        s.CONFIG = config_snapshot(s.CONFIG_FILES)
+    defaults = [APP_DEFAULT_PREFS_DIR / f for f in sorted(os.listdir(APP_DEFAULT_PREFS_DIR))
+                if Path(f).suffix in {'.ini', '.cfg'}] if APP_DEFAULT_PREFS_DIR.is_dir() else []
+    if defaults:
+        s.DEFAULTS = config_snapshot(defaults)['DEFAULT']
+
+def _read_env(s: SimpleNamespace):
+    s.ENV = Environment()
+
+# Config keys for `setuplog`, and the `setuplog` arguments they set.
+LOGGING_SCHEMA = compile_schema({'log_queue': Setting(bool, False),
+                                 'log_max_bytes': Setting(parse_size, 0),
+                                 'log_rotate': Setting(parse_interval, 0),
+                                 'log_backups': Setting(int, 5),
+                                 'log_compress': Setting(bool, True),
+                                 'log_format': Setting(str, 'text', LOG_FORMATS),
+                                 'log_rate_limit': Setting(int, 0),
+                                 'log_rate_interval': Setting(parse_interval, 60)})
+LOGGING_OPTIONS = {'log_queue': 'queued', 'log_max_bytes': 'max_bytes', 'log_rotate': 'rotate_every',
+                   'log_backups': 'backups', 'log_compress': 'compress', 'log_format': 'file_format',
+                   'log_rate_limit': 'rate_limit', 'log_rate_interval': 'rate_interval'}
+
+def _setup_logging(s: SimpleNamespace):
+    if s.ARGS and getattr(s.ARGS, 'log', None):
+        s.LOG_FILE = s.ARGS.log
+    elif s.CONFIG and 'log_file' in s.CONFIG['DEFAULT']:  # `parse_config` lowercases keys
+        s.LOG_FILE = s.CONFIG['DEFAULT']['log_file']
+    if s.ARGS:
+        if s.ARGS.debug or s.ARGS.testing:
+            s.LOG_LEVEL = logging.DEBUG
+        elif s.ARGS.verbose:
+            s.LOG_LEVEL = logging.INFO
+    options = LOGGING_SCHEMA(s.CONFIG['DEFAULT'] if s.CONFIG else dict())
+    if Path(s.LOG_FILE).parent.exists():
+        setuplog(Path(s.LOG_FILE), s.LOG_LEVEL, **{LOGGING_OPTIONS[k]: v for k, v in options.items()})
+
+def split_options(ns: SimpleNamespace | None) -> tuple[dict, dict]:
+    """
+    Split parsed options into `(given, defaults)`: options left at None,
+    False or [] go to a bottom layer so they don't hide the environment or
+    the configuration.
+    """
+    given, defaults = dict(), dict()
+    for k, v in (vars(ns) if ns else dict()).items():
+        (defaults if v is None or v is False or v == [] else given)[k] = v
+    return given, defaults
+
+def _set_log_level(key: str, old, new):
+    logging.getLogger().setLevel(new.upper() if isinstance(new, str) else new)
+
+# Serializes reloads; the new values go in with one `Layers.replace`, so
+# readers never see half a reload.
+_reload_lock = threading.Lock()
+
+PHASE_LOADERS = {'stdin': _read_stdin, 'prefs': _read_prefs, 'args': _parse_args,
+                 'config': _read_config, 'env': _read_env, 'logging': _setup_logging}
+
+def __getattr__(name: str):
+    if name in LOADED_NAMES:
+        phase = LOADED_NAMES[name]
+        Settings.load((phase,) if phase else None)
+        return getattr(_loaded, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class Settings(LayeredNamespace):
+    # Subclasses that don't need every phase (a worker that never reads
+    # stdin or the command line, say) can list only the ones they need.
+    phases: tuple[str, ...] = PHASES
+
+    # `{key: Setting(type, default, choices)}` for the settings a program
+    # relies on. Subclasses add to their bases' schemas. The values are
+    # converted and checked once, when the object is created, and stored
+    # on it, so `self.port` is already an int.
+    schema: dict[str, Setting] = dict()
+
+    @classmethod
+    def coercer(cls):
+        """ The compiled schema of this class, built on first use. """
+        if '_coerce' not in vars(cls):
+            schema = dict()
+            for base in reversed(cls.__mro__):
+                schema.update(vars(base).get('schema', dict()))
+            cls._coerce = staticmethod(compile_schema(schema))
+        return cls._coerce
+
+    @classmethod
+    def load(cls, phases: tuple[str, ...] | None = None) -> Layers:
+        """
+        Run the loading `phases` (all of `PHASES` by default) that haven't
+        run yet, plus the phases they require, and return the settings as
+        `Layers` (see `LAYERS`), so nothing is copied and every value knows
+        where it came from.
+        """
+        wanted = set()
+        todo = list(PHASES if phases is None else phases)
+        while todo:
+            phase = todo.pop()
+            if phase not in wanted:
+                wanted.add(phase)
+                todo.extend(PHASE_REQUIRES.get(phase, ()))
+        unknown = wanted - set(PHASES)
+        if unknown:
+            raise ValueError(f'Unknown settings phases: {sorted(unknown)}')
+        new = [p for p in PHASES if p in wanted and p not in _loaded.phases]
+        for phase in new:
+            PHASE_LOADERS[phase](_loaded)
+            _loaded.phases.append(phase)
+        if new:
+            given, defaults = split_options(_loaded.ARGS)
+            _loaded.SETTINGS = Layers(('input', {'input': _loaded.INPUT} if _loaded.INPUT else dict()),
+                                      ('cli', given),
+                                      ('env', _loaded.ENV or dict()),
+                                      ('user cfg', _loaded.CONFIG['DEFAULT'] if _loaded.CONFIG else dict()),
+                                      ('app defaults', _loaded.DEFAULTS),
+                                      ('cli defaults', defaults))
+        return _loaded.SETTINGS
 
-# print(f'{ARGS=}')
-
-LOG_LEVEL = logging.WARNING
-
-if ARGS:
-    if ARGS.debug or ARGS.testing:
-        LOG_LEVEL = logging.DEBUG
-    elif ARGS.verbose:
-        LOG_LEVEL = logging.INFO
-
-# print(f'{LOG_FILE=}\n{LOG_LEVEL=}')
-
-if LOG_FILE.parent.exists():
-    setuplog(LOG_FILE, LOG_LEVEL)
-
-SETTINGS = dict()
-if CONFIG: SETTINGS.update(dict(CONFIG['DEFAULT']))
-if ENV: SETTINGS.update(ENV)
-if ARGS: SETTINGS.update(vars(ARGS))
-if INPUT: SETTINGS.update({'input': INPUT})
-
-
-
-class Settings(SimpleNamespace):
     def __init__(self, *args, **kwargs):
-        super().__init__(**SETTINGS)
-        self.config_files = CONFIG_FILES
+        super().__init__(self.load(self.phases))
+        vars(self).update(self.coercer()(self._layers))
+        self.config_files = _loaded.CONFIG_FILES
         if TESTING: self.debug = True
         else: self.debug = DEBUG
         if self.debug: self.verbose = True
         else: self.verbose = VERBOSE
+        self._callbacks = dict()
+        self._group_callbacks = list()
+        self._config_layers = dict()
+        self._watcher = None
+
+    def on_change(self, key: str, callback: Callable[[str, object, object], None]):
+        """ Call `callback(key, old, new)` after a config reload changes `key`. """
+        self._callbacks.setdefault(key, list()).append(callback)
+
+    def on_any_change(self, keys: Iterable[str], callback: Callable[[dict[str, tuple[object, object]]], None]):
+        """
+        Call `callback({key: (old, new)})` once after a config reload changes
+        any of `keys`, with just those of `keys` that changed.
+        """
+        self._group_callbacks.append((frozenset(keys), callback))
+
+    def watch(self) -> ConfigWatcher:
+        """
+        Reload the configuration files in `USER_PREFS_DIR` (or the directory
+        of the `--config` file) whenever they change. A changed `log_level`
+        sets the root logger's level.
+        """
+        if not self._watcher:
+            for f in self.config_files:
+                self._config_layers[Path(f)] = self._read_layer(Path(f))
+            self.on_change('log_level', _set_log_level)
+            directory = Path(self.config_files[0]).parent if self.config_files else USER_PREFS_DIR
+            self._watcher = ConfigWatcher(directory, self.reload_config)
+            self._watcher.start()
+        return self._watcher
+
+    @staticmethod
+    def _read_layer(path: Path) -> dict:
+        return config_snapshot([path]).get('DEFAULT', dict()) if path.exists() else dict()
+
+    def reload_config(self, path: str | Path) -> dict:
+        """
+        Reparse the config file at `path` and swap the new user
+        configuration layer in. Keys set by the environment or the command
+        line keep their values. Returns `{key: new value}` for what changed.
+        """
+        path = Path(path)
+        with _reload_lock:
+            files = [Path(f) for f in self.config_files]
+            added = path not in files
+            if added:
+                from_prefs = not (_loaded.ARGS and getattr(_loaded.ARGS, 'config', None))
+                if not (from_prefs and path.parent == USER_PREFS_DIR and path.exists()):
+                    return dict()
+                self.config_files.append(path)
+                files.append(path)
+            previous_layer = self._config_layers.get(path)
+            self._config_layers[path] = self._read_layer(path)
+            merged = dict()
+            for f in files:
+                if f not in self._config_layers:
+                    self._config_layers[f] = self._read_layer(f)
+                merged.update(self._config_layers[f])
+            previous = self._layers.maps[self._layers.names.index('user cfg')]
+            # Both sides go through the schema, so callbacks compare like
+            # with like and '8888' replacing 8888 isn't a change.
+            old_typed = self.coercer()(self._layers)
+            changes = self._layers.replace('user cfg', merged)
+            try:
+                typed = self.coercer()(self._layers)
+            except ValueError:
+                # Keep running with the old values, and don't merge the bad file into later reloads.
+                self._layers.replace('user cfg', previous)
+                if previous_layer is None:
+                    self._config_layers.pop(path, None)
+                else:
+                    self._config_layers[path] = previous_layer
+                if added:
+                    self.config_files.remove(path)
+                raise
+            changes = {k: (old_typed.get(k, old), typed.get(k, new)) for k, (old, new) in changes.items()}
+            changes = {k: (old, new) for k, (old, new) in changes.items() if old != new}
+            vars(self).update({k: typed[k] for k in changes if k in typed})
+            _loaded.CONFIG = {**(_loaded.CONFIG or dict()), 'DEFAULT': merged}
+        if changes:
+            debug('Reloaded %s: %s', path, sorted(changes))
+        for key, (old, new) in changes.items():
+            for callback in self._callbacks.get(key, ()):
+                callback(key, old, new)
+        for keys, callback in self._group_callbacks:
+            if keys & changes.keys():
+                callback({k: v for k, v in changes.items() if k in keys})
+        return {key: new for key, (old, new) in changes.items()}
+
+    def input_lines(self) -> Iterator[str]:
+        """ Iterate over the piped input line by line. """
+        if _loaded.INPUT is not None:
+            return iter(_loaded.INPUT.splitlines(keepends=True))
+        return iter_lines()
+
+    def input_chunks(self, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """ Iterate over the piped input in chunks of at most `size` bytes. """
+        if _loaded.INPUT is not None:
+            data = _loaded.INPUT.encode()
+            return (data[i:i + size] for i in range(0, len(data), size))
+        return iter_chunks(size)
+
+    def input_map(self) -> mmap.mmap | None:
+        """ A zero-copy memory map of stdin if it is redirected from a regular file. """
+        return map_stdin()
 
     def dumps(self):
+        ARGS, CONFIG, ENV = _loaded.ARGS, _loaded.CONFIG, _loaded.ENV
         d = {k: v for k, v in vars(ARGS).items() if k != 'args'} if ARGS else 'None'
         return f'''
 Command line options:
@@ -154,24 +353,29 @@ Command line arguments:
     Defined in {ARGS_FILE}
 
 Environment variables:
-{ENV.dumps()}
+{ENV.dumps() if ENV else 'None'}
 
 Configuration files:
 {pformat(self.config_files)}
 
 Configuration:
-{pformat(dict(CONFIG['DEFAULT']) if CONFIG else 'WARNING! Configuration file does not exist!')}'''
+{pformat(dict(CONFIG['DEFAULT']) if CONFIG else 'WARNING! Configuration file does not exist!')}
+
+Settings (value and the layer it came from):
+{self._layers.dumps()}'''
 
     def dump(self):
         if RUNNING_GATEWAY:
             pass
         else:
-            debug(f"""{self.__class__.__name__} settings:
+            debug(lambda: f"""{self.__class__.__name__} settings:
 {self.dumps()}
 """)
     
 if __name__ == '__main__':
     debug(f'Running {PACKAGE_NAME}')
+    Settings.load()
+    ARGS, CONFIG = _loaded.ARGS, _loaded.CONFIG
     debug(f'{type(ARGS)=}')
     debug(f'{dict(CONFIG['DEFAULT'])=}')
     debug(f'''Settings:
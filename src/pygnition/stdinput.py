@@ -34,17 +34,59 @@ details here.
 
 """
 
+from collections.abc import Iterator
+import mmap
+import os
+import stat
 import sys
 # from rich import print as rp
 
+CHUNK_SIZE = 1 << 16
+
+@auto_doc()
+def stdin_is_piped() -> bool:
+    """ Return True if stdin is a pipe or a redirected file rather than a terminal. """
+    return sys.stdin is not None and not sys.stdin.isatty()
+
 @auto_doc()
 def get_piped_input() -> str|None:
-    """ Return any piped input. """
-    if not sys.stdin.isatty():
+    """ Return any piped input, all of it at once. """
+    if stdin_is_piped():
         INPUT = sys.stdin.read()
         return INPUT
     return None
 
+@auto_doc()
+def iter_lines() -> Iterator[str]:
+    """ Yield piped input one line at a time, as soon as each line arrives. """
+    if stdin_is_piped():
+        yield from sys.stdin
+
+@auto_doc()
+def iter_chunks(size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """ Yield piped input as bytes, in chunks of at most `size`, as soon as they arrive. """
+    if stdin_is_piped():
+        read = sys.stdin.buffer.read1
+        while chunk := read(size):
+            yield chunk
+
+@auto_doc()
+def map_stdin() -> mmap.mmap | None:
+    """
+    Return a read-only memory map of stdin when it is redirected from a
+    regular file (`program < big.log`), or None for pipes and terminals.
+    """
+    if not stdin_is_piped():
+        return None
+    try:
+        fd = sys.stdin.fileno()
+        st = os.fstat(fd)
+    except (OSError, ValueError):
+        return None
+    if not stat.S_ISREG(st.st_mode) or not st.st_size:
+        return None
+    return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+
 if __name__ == '__main__':
     from rich import print as rp
     
@@ -36,6 +36,8 @@ details here.
 
 
 # from argparse import ArgumentParser as AP
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial, singledispatch, wraps
 from glob import glob
 # from io import StringIO
@@ -43,7 +45,12 @@ import logging
 import os
 from pathlib import Path, PosixPath, WindowsPath
 import shlex
-from subprocess import run
+import signal
+from subprocess import PIPE, Popen, run
+import sys
+import threading
+import time
+from typing import NamedTuple
 
 from rich import print as rp
 from rich.columns import Columns
@@ -130,6 +137,115 @@ def _(s:str) -> None:
     # 🔴 Call run_cmd directly — NOT chk_cmd again
     return run_cmd(expanded)
 
+class CmdResult(NamedTuple):
+    command: str | list
+    returncode: int | None  # None if the command never started (see `stderr` for why).
+    stdout: str = ''
+    stderr: str = ''
+    seconds: float = 0.0
+    timed_out: bool = False
+    cancelled: bool = False  # Not started, or killed because another command failed.
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+def _kill(p: Popen):
+    """ Kill `p` and whatever it started (a shell runs the command as its child). """
+    try:
+        os.killpg(p.pid, signal.SIGKILL)
+    except (AttributeError, OSError):
+        p.kill()
+
+@auto_doc()
+def run_many(commands: Iterable[str | list] | Mapping[str, str | list],
+             max_workers: int | None = None,  # At most this many at once (default: min(32, CPU count + 4)).
+             timeout: float | None = None,     # Seconds before a command is killed.
+             fail_fast: bool = False,          # Kill the rest when a command fails.
+             stream: bool = True               # Print output as it arrives.
+            ) -> list[CmdResult]:             # One result per command, in the order given.
+    """
+    Run shell commands (strings, like `run_cmd`) or argument lists side by
+    side. Each line of output is printed as it arrives with a `[name]`
+    prefix: the key if `commands` is a mapping, else its index and program.
+    A command that can't be started gets a result with `returncode` None
+    and the error in `stderr`, and counts as a failure for `fail_fast`.
+    """
+    named = list(commands.items()) if isinstance(commands, Mapping) else list(enumerate(commands))
+    empty = [name for name, c in named if not (c.split() if isinstance(c, str) else c)]
+    if empty:
+        raise ValueError(f'run_many: empty command(s): {empty}')
+    if not isinstance(commands, Mapping):
+        named = [(f'{i}:{Path((c.split() if isinstance(c, str) else c)[0]).name}', c) for i, c in named]
+    width = max((len(name) for name, _ in named), default=0)
+    stop = threading.Event()
+    running = set()
+    killed = set()
+    lock = threading.Lock()
+
+    def read(pipe, lines: list, prefix: str, out):
+        for line in pipe:
+            lines.append(line)
+            if stream:
+                with lock:
+                    print(f'[{prefix:<{width}}] {line}', end='' if line.endswith(NEWLINE) else NEWLINE,
+                          file=out, flush=True)
+
+    def run_one(name: str, command) -> CmdResult:
+        start = time.monotonic()
+        # Checking `stop` and registering the process under one lock means
+        # `cancel()` either prevents the start or sees the process and kills it.
+        with lock:
+            if stop.is_set():
+                return CmdResult(command, None, cancelled=True)
+            try:
+                p = Popen(command, shell=isinstance(command, str), stdout=PIPE, stderr=PIPE,
+                          encoding='utf-8', errors='replace', start_new_session=True)
+            except (OSError, ValueError, TypeError) as e:
+                p, reason = None, f'{e}{NEWLINE}'
+            else:
+                running.add(p)
+        if p is None:
+            read([reason], [], name, sys.stderr)
+            if fail_fast:
+                cancel()
+            return CmdResult(command, None, stderr=reason, seconds=time.monotonic() - start)
+        timed_out = threading.Event()
+        timer = threading.Timer(timeout, lambda: (timed_out.set(), _kill(p))) if timeout else None
+        if timer:
+            timer.start()
+        out, err = list(), list()
+        err_reader = threading.Thread(target=read, args=(p.stderr, err, name, sys.stderr))
+        err_reader.start()
+        read(p.stdout, out, name, sys.stdout)
+        err_reader.join()
+        p.wait()
+        if timer:
+            timer.cancel()
+        with lock:
+            running.discard(p)
+            cancelled = p in killed
+        result = CmdResult(command, p.returncode, ''.join(out), ''.join(err),
+                           time.monotonic() - start, timed_out.is_set(), cancelled)
+        if fail_fast and not result.ok and not cancelled:
+            cancel()
+        return result
+
+    def cancel():
+        stop.set()
+        with lock:
+            killed.update(running)
+            for p in running:
+                _kill(p)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(run_one, name, command) for name, command in named]
+        try:
+            return [f.result() for f in futures]
+        except BaseException:
+            cancel()
+            raise
+
 @singledispatch
 def mkdir(arg):
     print(f'{STOP_PICT}{color_str('red', 'ERROR!')}: `mkdir` arg must be `str` or `Path`!')
@@ -244,7 +360,7 @@ def grep(s: str, f: str) -> str | None:
         print(f"❌ grep error:\n{p.stderr}")
     return p.stdout or None
 
-def find_def(s: str|obj, f: str) -> str | None:
+def find_def(s: str|object, f: str) -> str | None:
     """Search for variable, def, or class definitions matching `s` in file(s) `f`."""
     if type(s) is not str:
         s = s.__name__
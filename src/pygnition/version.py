@@ -1,6 +1,7 @@
 # pygnition/version.py
 import re
-import subprocess
+
+from ._git_info import git_info
 
 class Version(str):
     """Semantic-style version string with optional prefix/suffix.
@@ -68,15 +69,8 @@ class Version(str):
     @classmethod
     def from_git(cls, repo_path: str = ".") -> "Version":
         """Try to get the latest Git tag from the repo and return as Version."""
+        info = git_info(repo_path)
         try:
-            tag = (
-                subprocess.check_output(
-                    ["git", "-C", repo_path, "describe", "--tags", "--abbrev=0"],
-                    stderr=subprocess.DEVNULL,
-                )
-                .decode()
-                .strip()
-            )
-            return cls(tag)
+            return cls(info.latest_tag)
         except Exception:
             return cls("v0.0.1")  # default fallback
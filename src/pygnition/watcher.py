@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+from pathlib import Path
+
+from .startmeup import *
+
+MODULE_NAME = Path(__file__).stem
+
+__doc__ = f"""Python IDE for the command line.
+
+========== ⚠️  WARNING! ⚠️  ==========
+This project is currently under construction.
+Stay tuned for updates.
+
+Module: {PACKAGE_NAME}.{MODULE_NAME}
+Version: {VERSION}
+Author: {AUTHOR}
+Date: {LAST_SAVED_DATE}
+
+## Description
+
+This module defines the ConfigWatcher class, which reports changes to the
+configuration files in a directory from a background thread. It uses
+inotify (through ctypes) on Linux and polls `stat` everywhere else.
+
+## Typical Use
+```python
+watcher = ConfigWatcher(USER_PREFS_DIR, lambda path: print(f'{{path}} changed'))
+watcher.start()
+
+## Notes
+
+Editors often write a file in several steps, so events are collected for
+`settle` seconds and each changed file is reported once.
+
+## [GitHub]({get_upstream_url()})
+
+"""
+
+import ctypes
+import ctypes.util
+import os
+from pathlib import Path
+import select
+import struct
+import sys
+import threading
+from typing import Callable
+
+from .lumberjack import debug, warn
+
+CONFIG_SUFFIXES = ('.ini', '.cfg')
+
+# From <sys/inotify.h>
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+IN_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')
+
+def _inotify_libc():
+    """ Return libc if it has inotify, else None. """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        libc.inotify_init1
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+class ConfigWatcher:
+    @auto_doc(AUTO_DOC_HEAD)
+    def __init__(self,
+                 directory: str | Path,             # Directory to watch.
+                 callback: Callable[[Path], None],  # Called with the path of each file that changed.
+                 suffixes: tuple[str, ...] = CONFIG_SUFFIXES,
+                 interval: float = 1.0,             # Seconds between polls without inotify.
+                 settle: float = 0.1):              # Seconds to wait for more events before reporting.
+        self.directory = Path(directory)
+        self.callback = callback
+        self.suffixes = suffixes
+        self.interval = interval
+        self.settle = settle
+        self.backend = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """ Start watching in a daemon thread. """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        libc = _inotify_libc()
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC) if libc else -1
+        if fd >= 0 and libc.inotify_add_watch(fd, os.fsencode(self.directory), IN_MASK) >= 0:
+            self.backend = 'inotify'
+            target = lambda: self._watch_inotify(fd)
+        else:
+            if fd >= 0:
+                os.close(fd)
+            self.backend = 'poll'
+            target = self._watch_poll
+        debug(f'Watching {self.directory} ({self.backend})')
+        self._thread = threading.Thread(target=target, name=f'{type(self).__name__}', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _wanted(self, name: str) -> bool:
+        return Path(name).suffix in self.suffixes
+
+    def _report(self, names: set[str]):
+        for name in sorted(names):
+            try:
+                self.callback(self.directory / name)
+            except Exception as e:
+                warn(f'Reloading {name} failed: {e}')
+
+    def _watch_inotify(self, fd: int):
+        try:
+            while not self._stop.is_set():
+                if not select.select([fd], [], [], self.interval)[0]:
+                    continue
+                changed = set()
+                while True:
+                    try:
+                        data = os.read(fd, 65536)
+                    except BlockingIOError:
+                        if select.select([fd], [], [], self.settle)[0]:
+                            continue
+                        break
+                    i = 0
+                    while i < len(data):
+                        _, _, _, length = EVENT_HEADER.unpack_from(data, i)
+                        i += EVENT_HEADER.size
+                        name = data[i:i + length].rstrip(b'\0').decode(errors='surrogateescape')
+                        i += length
+                        if self._wanted(name):
+                            changed.add(name)
+                self._report(changed)
+        finally:
+            os.close(fd)
+
+    def _snapshot(self) -> dict[str, tuple[int, int]]:
+        try:
+            return {e.name: (e.stat().st_mtime_ns, e.stat().st_size)
+                    for e in os.scandir(self.directory) if self._wanted(e.name) and e.is_file()}
+        except OSError:
+            return dict()
+
+    def _watch_poll(self):
+        last = self._snapshot()
+        while not self._stop.wait(self.interval):
+            current = self._snapshot()
+            changed = {name for name in last.keys() | current.keys() if last.get(name) != current.get(name)}
+            last = current
+            self._report(changed)
+
+if __name__ == '__main__':
+    import time
+
+    from .where import USER_PREFS_DIR
+
+    w = ConfigWatcher(USER_PREFS_DIR, lambda p: print(f'Changed: {p}'))
+    w.start()
+    print(f'Watching {USER_PREFS_DIR} with {w.backend}. Press Ctrl+C to stop.')
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        w.stop()
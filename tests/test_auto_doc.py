@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Runs in a fresh interpreter: pytest itself imports doctest, which turns lazy docs off.
+CHILD = """
+import sys
+from pygnition import _auto_doc
+from pygnition.tools import cwd
+assert _auto_doc.LAZY_DOCS
+assert not (cwd.__doc__ or '').startswith('## ')
+import pydoc
+assert 'pydoc' not in sys.argv
+text = pydoc.render_doc(cwd)
+assert '#### Returns' in text, text
+assert cwd.__doc__.startswith('## ')
+"""
+
+def test_help_renders_lazy_function_docs(tmp_path):
+    env = {**os.environ, "HOME": str(tmp_path), "PYTHONPATH": str(SRC)}
+    env.pop("PYGNITION_AUTO_DOC", None)
+    result = subprocess.run([sys.executable, "-c", CHILD], env=env, stdin=subprocess.DEVNULL,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,35 @@
+from configparser import ConfigParser
+
+import pytest
+
+from pygnition.configure import flat_config, parse_config
+
+CASES = {
+    "continuation": "[a]\nx = 1\n  more\n\tand more\ny = 2\n",
+    "blank lines in a value": "[a]\nx = 1\n\n  after blank\n\ny = 2\n\n",
+    "indented keys": "[a]\n  x = 1\n  y = 2\n    z\n",
+    "delimiters": "[a]\nx: 1\ny = a: b\nz : c = d\nURL = http://host:80\n",
+    "comments": "# top\n[a]\n; semi\nx = 1\n# inside\n  still x\ny = 2 # kept\n",
+    "blank lines": "\n\n[a]\n\nx = 1\n\n\n[b]\n\ny=\n",
+    "defaults": "[DEFAULT]\nd = 0\n[a]\nx = 1\n[b]\nd = 2\n",
+}
+
+def parser_sections(text: str) -> dict[str, dict[str, str]]:
+    cp = ConfigParser(interpolation=None)
+    cp.read_string(text)
+    sections = {'DEFAULT': dict(cp.defaults())}
+    sections.update({s: dict(cp.items(s, raw=True)) for s in cp.sections()})
+    return sections
+
+@pytest.mark.parametrize("text", CASES.values(), ids=CASES.keys())
+def test_parse_config_matches_configparser(text):
+    parsed = parse_config(text)
+    expected = parser_sections(text)
+    assert set(parsed) == set(expected)
+    assert parsed['DEFAULT'] == expected['DEFAULT']
+    for section in expected.keys() - {'DEFAULT'}:
+        assert {**parsed['DEFAULT'], **parsed[section]} == expected[section]
+
+def test_flat_config_keeps_simple_line_rules():
+    text = "a = 1\n  b = 2\nx:y = z\nURL=http://h:80 # comment\n[section]\n# c = 3\nno delimiter\nE = a=b\n"
+    assert flat_config(text) == {'a': '1', 'b': '2', 'x:y': 'z', 'URL': 'http://h:80', 'E': 'a=b'}
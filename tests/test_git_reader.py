@@ -0,0 +1,67 @@
+import pytest
+import shutil
+import subprocess
+from pathlib import Path
+
+from pygnition import _git_reader as reader
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+def git(repo, *args, **env):
+    return subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True,
+                          text=True, env={"PATH": "/usr/bin:/bin", **env}).stdout.strip()
+
+# --- Fixture: small repository with tags and a remote ---
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "config", "user.email", "test@example.com")
+    git(tmp_path, "config", "user.name", "Test")
+    git(tmp_path, "remote", "add", "origin", "git@github.com:someone/project.git")
+    for i in range(1, 5):
+        (tmp_path / "numbers.txt").write_text("\n".join(str(n) for n in range(i * 500)))
+        git(tmp_path, "add", "-A")
+        git(tmp_path, "commit", "-q", "-m", f"commit {i}",
+            GIT_COMMITTER_DATE=f"170000000{i} +0000")
+        if i == 2:
+            git(tmp_path, "tag", "-a", "v1.0.2", "-m", "annotated")
+        if i == 3:
+            git(tmp_path, "tag", "v1.0.3")
+    return tmp_path
+
+# --- Tests ---
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_matches_git(repo, packed):
+    if packed:
+        git(repo, "gc", "-q")
+    git_dir = reader.find_git_dir(repo)
+
+    assert reader.config_value(git_dir, "remote.origin.url") == "git@github.com:someone/project.git"
+    head = reader.resolve_ref(git_dir)
+    assert head == git(repo, "rev-parse", "HEAD")
+    assert reader.commit_timestamp(git_dir, head) == 1700000004
+    assert reader.latest_tag(git_dir) == git(repo, "describe", "--tags", "--abbrev=0")
+
+    for sha in git(repo, "rev-list", "--all", "--objects").split():
+        if len(sha) == 40:
+            obj_type, body = reader.read_object(git_dir, sha)
+            expected = subprocess.run(["git", "-C", str(repo), "cat-file", obj_type.decode(), sha],
+                                      check=True, capture_output=True).stdout
+            assert body == expected
+
+def test_no_tags(tmp_path):
+    git(tmp_path, "init", "-q")
+    (tmp_path / "a.txt").write_text("a")
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "-c", "user.email=t@e.com", "-c", "user.name=T", "commit", "-q", "-m", "one")
+    git_dir = reader.find_git_dir(tmp_path)
+    assert reader.latest_tag(git_dir) is None
+    assert reader.config_value(git_dir, "remote.origin.url") is None
+
+def test_long_walk_falls_back(repo):
+    git(repo, "gc", "-q")
+    git_dir = reader.find_git_dir(repo)
+    with pytest.raises(ValueError):
+        reader.latest_tag(git_dir, max_commits=0)
+    assert reader.latest_tag(git_dir, max_commits=1) == "v1.0.3"
@@ -0,0 +1,52 @@
+import pytest
+
+from pygnition.environment import Environment
+from pygnition.layers import LayeredNamespace, Layers
+from pygnition.schema import Setting, SettingsError, compile_schema
+
+SCHEMA = compile_schema({"host": Setting(str, "127.0.0.1"),
+                         "port": Setting(int, 8888),
+                         "log_format": Setting(str, "text", ("text", "json")),
+                         "debug": Setting(bool, False)})
+
+@pytest.fixture
+def layers(monkeypatch):
+    monkeypatch.setenv("PYGNITION_PORT", "9000")
+    return Layers(("env", Environment()),
+                  ("user cfg", {"port": "8000", "host": "example.com"}),
+                  ("app defaults", {"port": "8888", "host": "localhost", "log_format": "text"}))
+
+def test_environment_over_config_over_defaults(layers):
+    assert layers["port"] == "9000"
+    assert layers["host"] == "example.com"
+    assert layers["log_format"] == "text"
+    assert "debug" not in layers
+    assert SCHEMA(layers) == {"host": "example.com", "port": 9000, "log_format": "text", "debug": False}
+
+def test_source_names_the_layer(layers):
+    assert layers.source("port") == "env"
+    assert layers.source("host") == "user cfg"
+    assert layers.source("log_format") == "app defaults"
+    assert layers.source("debug") is None
+    assert layers.provenance()["port"] == ("9000", "env")
+
+def test_replace_reports_changes_and_is_seen_by_the_namespace(layers):
+    ns = LayeredNamespace(layers)
+    assert ns.host == "example.com"
+    changes = layers.replace("user cfg", {"host": "other.com", "port": "1"})
+    # The environment still wins for the port, so only the host changed.
+    assert changes == {"host": ("example.com", "other.com")}
+    assert ns.host == "other.com"
+    assert layers.source("port") == "env"
+
+@pytest.mark.parametrize("key, value, message", [("port", "eighty", "port:"),
+                                                 ("log_format", "xml", "'xml' is not one of"),
+                                                 ("debug", "maybe", "not a boolean")])
+def test_bad_values_are_rejected(layers, key, value, message):
+    bad = layers.with_layers(top=[("cli", {key: value})])
+    with pytest.raises(SettingsError, match=message):
+        SCHEMA(bad)
+
+def test_required_setting_is_missing():
+    with pytest.raises(SettingsError, match="name is required"):
+        compile_schema({"name": Setting(str)})(Layers())
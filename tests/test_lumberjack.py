@@ -0,0 +1,135 @@
+import gzip
+import json
+import logging
+import time
+from pathlib import Path
+
+import pytest
+
+from pygnition import lumberjack
+
+@pytest.fixture
+def logger():
+    log = logging.getLogger("test-lumberjack")
+    log.propagate = False
+    log.setLevel(logging.DEBUG)
+    yield log
+    for handler in list(log.handlers):
+        log.removeHandler(handler)
+        handler.close()
+
+@pytest.fixture
+def root_logger():
+    """ Undoes `setuplog()`: its handlers, queue listener, level and rate limit. """
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    lumberjack.stop_queued_logging()
+    lumberjack.limit_rate(0)
+    for handler in list(root.handlers):
+        if handler not in handlers:
+            root.removeHandler(handler)
+            handler.close()
+    root.setLevel(level)
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+def wait_for_compressor():
+    if lumberjack._compressor:
+        lumberjack._compressor.submit(lambda: None).result()
+
+def segment_lines(path: Path) -> list[str]:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt") as f:
+        return f.read().splitlines()
+
+def test_rotation_keeps_newest_segments_when_compression_lags(tmp_path, logger, monkeypatch):
+    compress = lumberjack._compress
+    monkeypatch.setattr(lumberjack, "_compress", lambda segment: (time.sleep(0.05), compress(segment)))
+    base = tmp_path / "app.log"
+    handler = lumberjack.RotatingLogHandler(base, max_bytes=500, backups=3)
+    logger.addHandler(handler)
+    for i in range(400):
+        logger.info("line %04d", i)
+    wait_for_compressor()
+
+    segments = [Path(p) for _, p in lumberjack._segments(str(base))]
+    assert len(segments) == 3
+    assert all(p.suffix == ".gz" for p in segments)
+    kept = [line for p in reversed(segments) for line in segment_lines(p)] + base.read_text().splitlines()
+    numbers = [int(line.split()[1]) for line in kept]
+    assert numbers == list(range(numbers[0], 400))
+
+def test_queued_logging_writes_from_the_listener_thread(tmp_path, root_logger):
+    log_file = tmp_path / "app.log"
+    before = list(root_logger.handlers)
+    lumberjack.setuplog(log_file, logging.INFO, queued=True)
+    # Only the queue handler goes on the logger; the file handler belongs to the listener.
+    added = [h for h in root_logger.handlers if h not in before]
+    assert [type(h) for h in added] == [lumberjack.ContextQueueHandler]
+    lumberjack.info("first %d", 1)
+    # The listener flushes its batch once the queue runs dry, without waiting for exit.
+    wait_for(lambda: "first 1" in log_file.read_text())
+    lumberjack.warn("second")
+    lumberjack.stop_queued_logging()
+    lines = log_file.read_text().splitlines()
+    assert [line for line in lines if "first" in line or "second" in line] == \
+        [f"{lumberjack.LOG_PICTS[logging.INFO]}first 1", f"{lumberjack.LOG_PICTS[logging.WARNING]}second"]
+
+class Exploding:
+    def __str__(self):
+        raise AssertionError("formatted a message below the logging level")
+
+def test_messages_below_the_level_are_not_formatted(root_logger):
+    root_logger.setLevel(logging.WARNING)
+    called = list()
+    lumberjack.debug(lambda: called.append("debug") or "debug")
+    lumberjack.info("%s", Exploding())
+    assert called == []
+    assert not lumberjack.enabled(logging.INFO)
+    lumberjack.warn(lambda: called.append("warn") or "warn")
+    assert called == ["warn"]
+
+@pytest.mark.parametrize("queued", [False, True])
+def test_json_log_file(tmp_path, root_logger, queued):
+    log_file = tmp_path / "app.json"
+    lumberjack.setuplog(log_file, logging.INFO, queued=queued, file_format="json")
+    token = lumberjack.COMMAND_NAME.set("build")
+    try:
+        lumberjack.info("built %d files\nin two lines", 3, target="docs")
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logging.getLogger().exception("failed")
+    finally:
+        lumberjack.COMMAND_NAME.reset(token)
+    lumberjack.stop_queued_logging()
+    for handler in root_logger.handlers:
+        handler.flush()
+    # Queued records keep their command and traceback. One object per record, no blank spacer lines.
+    records = [json.loads(line) for line in log_file.read_text().splitlines()]
+    built, failed = records[-2:]
+    assert built["level"] == "INFO"
+    assert built["message"] == "built 3 files\nin two lines"
+    assert built["command"] == "build"
+    assert built["target"] == "docs"
+    assert built["module"] == "test_lumberjack"
+    assert failed["level"] == "ERROR"
+    assert "ZeroDivisionError" in failed["exception"]
+
+def test_rate_limit_leaves_errors_alone(tmp_path, root_logger):
+    log_file = tmp_path / "app.log"
+    lumberjack.setuplog(log_file, logging.INFO, rate_limit=2, rate_interval=60)
+    for i in range(5):
+        lumberjack.warn("disk %d is full", i)
+        lumberjack.error("disk %d failed", i)
+    lumberjack.limit_rate(0)  # reports what was suppressed
+    text = log_file.read_text()
+    # Limited by template, not by the formatted message.
+    assert [i for i in range(5) if f"disk {i} is full" in text] == [0, 1]
+    assert [i for i in range(5) if f"disk {i} failed" in text] == [0, 1, 2, 3, 4]
+    assert "Suppressed 3 similar messages: disk %d is full" in text
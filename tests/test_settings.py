@@ -0,0 +1,86 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Reads the lazy module attributes before any `Settings` object exists.
+CHILD = """
+import json
+import pygnition.settings as settings
+print(json.dumps([settings.LOG_LEVEL, [str(f) for f in settings.CONFIG_FILES],
+                  settings.CONFIG['DEFAULT'].get('alt_key')]))
+"""
+
+def test_lazy_attributes_see_command_line(tmp_path):
+    alt = tmp_path / "alt.ini"
+    alt.write_text("ALT_KEY = here\n")
+    script = tmp_path / "child.py"
+    script.write_text(CHILD)
+    env = {**os.environ, "HOME": str(tmp_path), "PYTHONPATH": str(SRC)}
+    result = subprocess.run([sys.executable, str(script), "-c", str(alt), "-d"], env=env,
+                            stdin=subprocess.DEVNULL, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    level, files, value = json.loads(result.stdout.strip().splitlines()[-1])
+    assert level == logging.DEBUG
+    assert files == [str(alt)]
+    assert value == "here"
+
+def test_log_file_from_config(tmp_path):
+    prefs = tmp_path / ".pygnition" / "etc"
+    prefs.mkdir(parents=True)
+    log_file = tmp_path / "custom" / "mine.log"
+    log_file.parent.mkdir()
+    (prefs / "config.ini").write_text(f"LOG_FILE = {log_file}\n")
+    script = tmp_path / "child.py"
+    script.write_text("import pygnition.settings as settings\nprint(settings.LOG_FILE)\n")
+    env = {**os.environ, "HOME": str(tmp_path), "PYTHONPATH": str(SRC)}
+    result = subprocess.run([sys.executable, str(script)], env=env,
+                            stdin=subprocess.DEVNULL, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == str(log_file)
+    assert log_file.exists()
+
+RELOAD_CHILD = """
+import json, sys
+from pygnition.schema import Setting
+from pygnition.settings import Settings
+
+class Server(Settings):
+    phases = ('prefs', 'config', 'env')
+    schema = {'host': Setting(str, 'localhost'), 'port': Setting(int, 8888)}
+
+s = Server()
+calls = []
+s.on_change('port', lambda key, old, new: calls.append([key, old, new]))
+s.on_any_change(('host', 'port'), lambda changes: calls.append(sorted(changes.items())))
+config = sys.argv[1]
+with open(config, 'w') as f:
+    f.write('HOST = example.com\\nPORT = 9999\\n')
+s.reload_config(config)
+calls.append('--')
+with open(config, 'w') as f:
+    f.write('HOST = example.com\\nPORT = 09999\\n')
+s.reload_config(config)
+print(json.dumps(calls))
+"""
+
+def test_reload_coerces_both_sides_and_batches(tmp_path):
+    prefs = tmp_path / ".pygnition" / "etc"
+    prefs.mkdir(parents=True)
+    config = prefs / "config.ini"
+    config.write_text("HOST = old.example.com\nPORT = 8888\n")
+    script = tmp_path / "child.py"
+    script.write_text(RELOAD_CHILD)
+    env = {**os.environ, "HOME": str(tmp_path), "PYTHONPATH": str(SRC)}
+    result = subprocess.run([sys.executable, str(script), str(config)], env=env,
+                            stdin=subprocess.DEVNULL, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    calls = json.loads(result.stdout.strip().splitlines()[-1])
+    # '09999' is a different string but the same port, so the second reload changes nothing.
+    assert calls == [["port", 8888, 9999],
+                     [["host", ["old.example.com", "example.com"]], ["port", [8888, 9999]]],
+                     "--"]
@@ -0,0 +1,90 @@
+"""
+Startup benchmarks: import each entry module in fresh interpreters and fail
+when it takes longer, spawns more processes or uses more memory than its
+budget in `startup_budgets.json`.
+
+Every run is appended as one JSON line to the history file
+(`.benchmarks/startup-history.jsonl` at the repository root, or
+`$PYGNITION_STARTUP_HISTORY`). `$PYGNITION_STARTUP_RUNS` sets the number of
+warm runs per module and `$PYGNITION_STARTUP_BUDGET_SCALE` multiplies the
+time budgets on slow machines.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+BUDGETS_FILE = Path(__file__).with_name("startup_budgets.json")
+HISTORY_FILE = Path(os.environ.get("PYGNITION_STARTUP_HISTORY", ROOT / ".benchmarks" / "startup-history.jsonl"))
+WARM_RUNS = int(os.environ.get("PYGNITION_STARTUP_RUNS", "3"))
+TIME_SCALE = float(os.environ.get("PYGNITION_STARTUP_BUDGET_SCALE", "1"))
+
+MODULES = ["pygnition", "pygnition.program", "pygnition.settings",
+           "pygnition.driver", "pygnition.files", "pygnition.server"]
+
+# Runs in the child: count process spawns through audit hooks, time the
+# import and report the peak RSS.
+CHILD = r"""
+import json, resource, sys, time
+SPAWN_EVENTS = {'subprocess.Popen', 'os.system', 'os.posix_spawn', 'os.spawn', 'os.fork', 'os.exec'}
+spawned = []
+sys.addaudithook(lambda event, args: spawned.append(event) if event in SPAWN_EVENTS else None)
+start = time.perf_counter()
+__import__(sys.argv[1])
+import_s = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+with open(sys.argv[2], 'w') as f:
+    json.dump({'import_ms': import_s * 1000,
+               'forks': len(spawned),
+               'peak_rss_mb': rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)}, f)
+"""
+
+def measure(module: str, home: Path, out: Path) -> dict:
+    """ Import `module` once in a fresh interpreter that uses `home` for its caches. """
+    env = {**os.environ, "HOME": str(home), "PYTHONPATH": str(SRC)}
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    start = time.perf_counter()
+    p = subprocess.run([sys.executable, "-X", f"pycache_prefix={home / 'pycache'}", "-c", CHILD, module, str(out)],
+                       cwd=ROOT, env=env, stdin=subprocess.DEVNULL, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    assert p.returncode == 0, f"Importing {module} failed:\n{p.stderr}"
+    return {**json.loads(out.read_text()), "process_ms": wall_ms}
+
+def budget(module: str) -> dict:
+    budgets = json.loads(BUDGETS_FILE.read_text())
+    return {**budgets["default"], **budgets.get(module, {})}
+
+def record(entry: dict):
+    HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(HISTORY_FILE, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+@pytest.mark.parametrize("module", MODULES)
+def test_startup_budget(module, tmp_path):
+    # Cold: empty bytecode and user caches. Warm: the same ones, now filled.
+    cold = measure(module, tmp_path, tmp_path / "cold.json")
+    warm = [measure(module, tmp_path, tmp_path / f"warm{i}.json") for i in range(WARM_RUNS)]
+    result = {
+        "cold_ms": cold["import_ms"],
+        "warm_ms": statistics.median(r["import_ms"] for r in warm),
+        "process_ms": statistics.median(r["process_ms"] for r in warm),
+        "forks": max(r["forks"] for r in [cold, *warm]),
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in [cold, *warm]),
+    }
+    record({"time": time.time(), "module": module, "python": platform.python_version(),
+            "machine": platform.node(), **result})
+
+    limits = budget(module)
+    over = [f"{key} = {result[key]:.1f} > {limit * (TIME_SCALE if key.endswith('_ms') else 1):.1f}"
+            for key, limit in limits.items()
+            if result[key] > limit * (TIME_SCALE if key.endswith("_ms") else 1)]
+    assert not over, f"{module} is over its startup budget: " + ", ".join(over)
@@ -0,0 +1,42 @@
+import sys
+import time
+
+from pygnition.tools import run_many
+
+PY = sys.executable
+
+def test_results_follow_the_given_order(capsys):
+    commands = {"slow": [PY, "-c", "import time; time.sleep(0.3); print('slow')"],
+                "fast": [PY, "-c", "print('fast')"]}
+    results = run_many(commands)
+    assert [r.stdout for r in results] == ["slow\n", "fast\n"]
+    assert all(r.ok for r in results)
+    # Streamed output arrives as it is printed, with the key as prefix.
+    out = capsys.readouterr().out.splitlines()
+    assert out == ["[fast] fast", "[slow] slow"]
+
+def test_command_that_cannot_start():
+    results = run_many([["/nonexistent/program"], [PY, "-c", "pass"]], stream=False)
+    assert results[0].returncode is None
+    assert not results[0].ok
+    assert "/nonexistent/program" in results[0].stderr
+    assert results[1].ok
+
+def test_fail_fast_cancels_the_rest():
+    start = time.monotonic()
+    results = run_many([[PY, "-c", "import sys, time; time.sleep(0.3); sys.exit(3)"],
+                        [PY, "-c", "import time; time.sleep(30)"],
+                        [PY, "-c", "import time; time.sleep(30)"]],
+                       max_workers=2, fail_fast=True, stream=False)
+    assert time.monotonic() - start < 10
+    assert results[0].returncode == 3 and not results[0].cancelled
+    # The second was running and is killed, the third never starts.
+    assert results[1].cancelled and results[1].returncode is not None
+    assert results[2].cancelled and results[2].returncode is None
+
+def test_timeout_kills_the_command():
+    results = run_many([[PY, "-c", "import time; time.sleep(30)"], [PY, "-c", "pass"]],
+                       timeout=0.5, stream=False)
+    assert results[0].timed_out and not results[0].ok
+    assert results[0].seconds < 10
+    assert not results[1].timed_out and results[1].ok